@@ -0,0 +1,240 @@
+import os
+import time
+import hashlib
+import zipfile
+import threading
+from datetime import datetime
+from typing import NamedTuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from idx_download_watcher import DownloadError
+
+BASE_DOWNLOAD = "https://www.idx.co.id"
+CHUNK_SIZE = 1024 * 1024
+
+
+def log(msg):
+    ts = datetime.now().strftime("%H:%M:%S")
+    print(f"[{ts}] {msg}")
+
+
+class DownloadTask(NamedTuple):
+    code: str
+    year: int
+    fname: str
+    url: str
+    save_dir: str
+
+
+def is_statement_file(fname):
+    """instance.zip atau FinancialStatement*.pdf"""
+    return (
+        "instance.zip" in fname
+        or ("FinancialStatement" in fname and fname.lower().endswith(".pdf"))
+    )
+
+
+def cookies_from_driver(driver):
+    """Ambil cookie + user agent dari browser (sekali saja, setelah lolos Cloudflare)"""
+    jar = requests.cookies.RequestsCookieJar()
+    for c in driver.get_cookies():
+        jar.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+    user_agent = driver.execute_script("return navigator.userAgent")
+    return jar, user_agent
+
+
+class BrowserDownloader:
+    """
+    Fallback download lewat browser + DownloadWatcher kalau HTTP ditolak
+    (mis. 403 dari Cloudflare). Satu browser -> satu download sekaligus.
+    """
+
+    def __init__(self, driver, watcher, timeout=120, stall_timeout=60):
+        self.driver = driver
+        self.watcher = watcher
+        self.timeout = timeout
+        self.stall_timeout = stall_timeout
+        self._lock = threading.Lock()
+
+    def download(self, url, fname, dst_path):
+        with self._lock:
+            stale = self.watcher.snapshot()  # partial sisa sesi Chrome lama tidak ditunggu
+            self.driver.get(url)
+            src_path = self.watcher.wait_for(fname, timeout=self.timeout,
+                                             stall_timeout=self.stall_timeout, ignore=stale)
+            os.replace(src_path, dst_path)
+
+
+class DownloadPool:
+    """
+    Pool worker HTTP untuk download file laporan keuangan.
+    Tiap thread punya requests.Session sendiri (keep-alive), cookie diambil
+    dari browser. Hasil disimpan ke {save_dir}/{fname}, zip langsung diekstrak.
+    Kalau `manifest` (DownloadManifest) diisi, hasil download dicatat (ukuran,
+    sha256, ETag/Last-Modified). File yang sudah terverifikasi dicek ulang
+    dengan conditional request (If-None-Match / If-Modified-Since), 304 =
+    tidak berubah, tidak di-download lagi. `revalidate=False` langsung skip.
+    `fallback` (BrowserDownloader) dipakai kalau server menolak dengan 403.
+    `extract=False` menyimpan zip apa adanya (xbrl_to_json.py --zip membacanya langsung).
+    """
+
+    def __init__(self, cookies, user_agent, workers=8, max_retries=3, timeout=300,
+                 manifest=None, revalidate=True, fallback=None, extract=True):
+        self.cookies = cookies
+        self.user_agent = user_agent
+        self.workers = workers
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.manifest = manifest
+        self.revalidate = revalidate
+        self.fallback = fallback
+        self.extract = extract
+        self.failed_files = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._futures = []
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.cookies.update(self.cookies)
+            session.headers.update({
+                "User-Agent": self.user_agent,
+                "Referer": BASE_DOWNLOAD + "/",
+            })
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._local.session = session
+        return session
+
+    def _fail(self, task, reason):
+        with self._lock:
+            self.failed_files.append({
+                "File": task.fname,
+                "Company": task.code,
+                "Year": task.year,
+                "Reason": reason
+            })
+
+    def submit(self, task):
+        self._futures.append(self._executor.submit(self._run, task))
+
+    def join(self):
+        """Tunggu semua download selesai, return failed_files"""
+        for fut in self._futures:
+            fut.result()
+        self._futures = []
+        self._executor.shutdown(wait=True)
+        return self.failed_files
+
+    def _fetch(self, task, dst_path, cached=None):
+        """Download ke dst_path. Return False kalau server menjawab 304 (cache hit)"""
+        headers = {}
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        tmp_path = dst_path + ".part"
+        h = hashlib.sha256()
+        size = 0
+        with self._session().get(task.url, headers=headers, stream=True,
+                                 timeout=(30, self.timeout)) as resp:
+            if resp.status_code == 304:
+                return False
+            resp.raise_for_status()
+            with open(tmp_path, "wb") as f:
+                for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+                    h.update(chunk)
+                    size += len(chunk)
+            expected = resp.headers.get("Content-Length")
+            if expected is not None and not resp.headers.get("Content-Encoding") and int(expected) != size:
+                raise OSError(f"Truncated download: {size} of {expected} bytes")
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+        os.replace(tmp_path, dst_path)
+
+        if self.manifest is not None:
+            self.manifest.record_download(
+                task.code, task.year, task.fname, task.url, dst_path,
+                size=size, sha256=h.hexdigest(), etag=etag, last_modified=last_modified
+            )
+        return True
+
+    def _fetch_browser(self, task, dst_path):
+        self.fallback.download(task.url, task.fname, dst_path)
+        if self.manifest is not None:
+            self.manifest.record_download(task.code, task.year, task.fname, task.url, dst_path)
+        return True
+
+    def _extract(self, task, dst_path):
+        try:
+            extract_dir = os.path.join(task.save_dir, task.fname.replace(".zip", ""))
+            os.makedirs(extract_dir, exist_ok=True)
+            with zipfile.ZipFile(dst_path, 'r') as zip_ref:
+                zip_ref.extractall(extract_dir)
+            log(f"EXTRACT: {task.fname} -> {extract_dir}")
+            if self.manifest is not None:
+                self.manifest.record_extract(task.code, task.year, task.fname, "ok")
+        except Exception as e:
+            log(f"ERR-UNZIP: {task.fname} | {e}")
+            if self.manifest is not None:
+                self.manifest.record_extract(task.code, task.year, task.fname, f"error: {e}")
+            self._fail(task, f"Unzip error: {e}")
+
+    def _run(self, task):
+        os.makedirs(task.save_dir, exist_ok=True)
+        dst_path = os.path.join(task.save_dir, task.fname)
+        is_zip = self.extract and task.fname.lower().endswith(".zip")
+
+        # Verified files (size + sha256, file lokal dipakai lagi): skip, or revalidate with a conditional request
+        cached = None
+        if self.manifest is not None and self.manifest.is_verified(task.code, task.year, task.fname, dst_path,
+                                                                   verify_hash=True):
+            entry = self.manifest.get(task.code, task.year, task.fname)
+            if self.revalidate and (entry["etag"] or entry["last_modified"]):
+                cached = entry
+            else:
+                log(f"SKIP (verified): {dst_path}")
+                if is_zip and self.manifest.needs_extract(task.code, task.year, task.fname):
+                    self._extract(task, dst_path)
+                return
+
+        # Retry loop
+        use_browser = False
+        for attempt in range(1, self.max_retries + 1):
+            action = "REVALIDATE" if cached is not None else "DOWNLOAD"
+            log(f"{action} (attempt {attempt}): {task.fname} -> {task.url}")
+            try:
+                if use_browser:
+                    modified = self._fetch_browser(task, dst_path)
+                else:
+                    modified = self._fetch(task, dst_path, cached)
+                if not modified:
+                    log(f"NOT MODIFIED (304): {dst_path}")
+                    if is_zip and self.manifest.needs_extract(task.code, task.year, task.fname):
+                        self._extract(task, dst_path)
+                    return
+                log(f"DONE: {task.fname} -> {dst_path}")
+                break
+            except (requests.RequestException, DownloadError, OSError) as e:
+                log(f"FAIL: {task.fname} | {e} (attempt {attempt})")
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                if status == 403 and self.fallback is not None and not use_browser:
+                    log(f"FALLBACK (browser): {task.fname}")
+                    use_browser = True
+                if attempt == self.max_retries:
+                    self._fail(task, f"{e} after {self.max_retries} attempts")
+                    return
+                time.sleep(2 ** attempt)
+
+        if is_zip:
+            self._extract(task, dst_path)
@@ -0,0 +1,138 @@
+import os
+import hashlib
+import sqlite3
+import zipfile
+import threading
+from datetime import datetime
+
+MANIFEST_PATH = "download_manifest.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    code           TEXT NOT NULL,
+    year           TEXT NOT NULL,
+    fname          TEXT NOT NULL,
+    url            TEXT,
+    path           TEXT,
+    size           INTEGER,
+    sha256         TEXT,
+    etag           TEXT,
+    last_modified  TEXT,
+    extract_status TEXT,
+    updated_at     TEXT,
+    PRIMARY KEY (code, year, fname)
+)
+"""
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def looks_complete(path):
+    """Cek kasar file lama tanpa catatan manifest: zip valid / pdf ada %%EOF"""
+    try:
+        if path.lower().endswith(".zip"):
+            with zipfile.ZipFile(path) as z:
+                return z.testzip() is None
+        if path.lower().endswith(".pdf"):
+            with open(path, "rb") as f:
+                if f.read(5) != b"%PDF-":
+                    return False
+                f.seek(max(os.path.getsize(path) - 1024, 0))
+                return b"%%EOF" in f.read()
+        return os.path.getsize(path) > 0
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+def same_path(a, b):
+    return a is not None and os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+
+class DownloadManifest:
+    """
+    Catatan persisten file yang sudah di-download (SQLite), key
+    (KodeEmiten, year, file name). Dipakai untuk skip file yang sudah
+    terverifikasi, download ulang file korup, dan resume setelah crash.
+    Satu manifest per pohon tujuan (data/ dan missing_data/ masing-masing
+    punya file sendiri); baris yang `path`-nya bukan file yang dicek
+    dianggap belum tercatat. Aman dipakai dari banyak thread.
+    """
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get(self, code, year, fname):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM downloads WHERE code=? AND year=? AND fname=?",
+                (code, str(year), fname)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def record_download(self, code, year, fname, url, path, size=None, sha256=None,
+                        etag=None, last_modified=None):
+        if size is None:
+            size = os.path.getsize(path)
+        if sha256 is None:
+            sha256 = file_sha256(path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO downloads "
+                "(code, year, fname, url, path, size, sha256, etag, last_modified, extract_status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, ?)",
+                (code, str(year), fname, url, path, size, sha256, etag, last_modified,
+                 datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+    def record_extract(self, code, year, fname, status):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE downloads SET extract_status=?, updated_at=? "
+                "WHERE code=? AND year=? AND fname=?",
+                (status, datetime.now().isoformat(), code, str(year), fname)
+            )
+            self._conn.commit()
+
+    def is_verified(self, code, year, fname, path, verify_hash=False):
+        """
+        True kalau file di `path` cocok dengan catatan manifest (ukuran, dan
+        sha256 kalau verify_hash). File lama tanpa catatan (atau dengan
+        catatan milik path lain) dicek dengan looks_complete() lalu dicatat.
+        """
+        if not os.path.exists(path):
+            return False
+        entry = self.get(code, year, fname)
+        if entry is not None and not same_path(entry["path"], path):
+            entry = None  # baris dari pohon download lain, validator/ukurannya bukan untuk file ini
+        if entry is None or entry["sha256"] is None:
+            if looks_complete(path):
+                self.record_download(code, year, fname, entry["url"] if entry else None, path)
+                return True
+            return False
+        if os.path.getsize(path) != entry["size"]:
+            return False
+        if verify_hash and file_sha256(path) != entry["sha256"]:
+            return False
+        return True
+
+    def needs_extract(self, code, year, fname):
+        entry = self.get(code, year, fname)
+        return entry is None or entry["extract_status"] != "ok"
@@ -0,0 +1,109 @@
+import os
+import time
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:  # non-Linux / package tidak terpasang -> polling
+    INotify = None
+
+PARTIAL_SUFFIX = ".crdownload"
+
+
+class DownloadError(Exception):
+    pass
+
+
+class DownloadWatcher:
+    """
+    Tunggu file download browser selesai di `download_root`.
+
+    Pakai inotify (inotify_simple) kalau tersedia, selain itu polling singkat.
+    File dianggap selesai kalau nama finalnya ada dengan ukuran > 0 yang
+    tidak berubah antar dua scan (Chrome baru me-rename partial ke nama final
+    setelah selesai). Partial `.crdownload` baru yang tidak bertambah selama
+    `stall_timeout` detik dianggap macet; partial sisa sesi lama (snapshot()
+    sebelum driver.get) tidak dihitung.
+    """
+
+    def __init__(self, download_root, poll_interval=0.5):
+        self.download_root = download_root
+        self.poll_interval = poll_interval
+        self._inotify = None
+        if INotify is not None:
+            try:
+                self._inotify = INotify()
+                self._inotify.add_watch(
+                    download_root,
+                    flags.CREATE | flags.MODIFY | flags.CLOSE_WRITE | flags.MOVED_TO
+                )
+            except OSError:
+                self._inotify = None
+
+    @property
+    def backend(self):
+        return "inotify" if self._inotify is not None else "polling"
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _wait_event(self, seconds):
+        if self._inotify is not None:
+            self._inotify.read(timeout=int(max(seconds, 0.01) * 1000))
+        else:
+            time.sleep(min(seconds, self.poll_interval))
+
+    def snapshot(self):
+        """Partial .crdownload yang sudah ada sebelum download dimulai"""
+        with os.scandir(self.download_root) as it:
+            return {entry.name for entry in it if entry.name.endswith(PARTIAL_SUFFIX)}
+
+    def _scan(self, fname, ignore=()):
+        """return (ukuran file final atau None, total ukuran partial baru atau None)"""
+        final_size = None
+        partial_size = None
+        with os.scandir(self.download_root) as it:
+            for entry in it:
+                if entry.name == fname:
+                    final_size = entry.stat().st_size
+                elif entry.name.endswith(PARTIAL_SUFFIX) and entry.name not in ignore:
+                    partial_size = (partial_size or 0) + entry.stat().st_size
+        return final_size, partial_size
+
+    def wait_for(self, fname, timeout=120, stall_timeout=60, ignore=()):
+        """
+        Return path file yang sudah lengkap, raise DownloadError kalau
+        tidak muncul dalam `timeout` detik atau partial-nya macet.
+        `ignore`: hasil snapshot() sebelum driver.get.
+        """
+        start = last_progress = time.monotonic()
+        last_partial = last_final = None
+
+        while True:
+            final_size, partial_size = self._scan(fname, ignore)
+            if final_size:
+                if final_size == last_final:
+                    return os.path.join(self.download_root, fname)
+                last_final = final_size
+                self._wait_event(self.poll_interval)
+                continue
+
+            now = time.monotonic()
+            if partial_size is not None:
+                if partial_size != last_partial:
+                    last_partial = partial_size
+                    last_progress = now
+                elif now - last_progress > stall_timeout:
+                    raise DownloadError(
+                        f"Stalled at {partial_size} bytes for {stall_timeout}s"
+                    )
+                wait = stall_timeout - (now - last_progress)
+            else:
+                if now - start > timeout:
+                    if final_size == 0:
+                        raise DownloadError("Empty file after download")
+                    raise DownloadError(f"Not found after {timeout}s")
+                wait = timeout - (now - start)
+
+            self._wait_event(min(wait, 1.0))
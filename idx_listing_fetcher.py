@@ -0,0 +1,108 @@
+import math
+import asyncio
+from typing import Any, Dict, List, NamedTuple
+
+import aiohttp
+
+from idx_download_engine import log
+
+BASE_URL = "https://www.idx.co.id/primary/ListedCompany/GetFinancialReport"
+
+
+def build_url(page, page_size=36, year=2021, report_type="rdf", emiten_type="s", periode="audit"):
+    return (f"{BASE_URL}?indexFrom={page}"
+            f"&pageSize={page_size}"
+            f"&year={year}"
+            f"&reportType={report_type}"
+            f"&EmitenType={emiten_type}"
+            f"&periode={periode}"
+            f"&kodeEmiten="
+            f"&SortColumn=KodeEmiten&SortOrder=asc")
+
+
+class ListingRecord(NamedTuple):
+    KodeEmiten: str
+    NamaEmiten: str
+    Report_Year: int
+    Attachments: List[Dict[str, Any]]
+
+
+class ListingFetcher:
+    """
+    Ambil semua halaman GetFinancialReport secara paralel (asyncio).
+    Halaman 1 dipakai untuk ResultCount, sisanya diambil bersamaan dengan
+    batas `concurrency`. Record di-yield begitu halamannya selesai.
+    """
+
+    def __init__(self, cookies, user_agent, year, page_size=36, concurrency=4,
+                 max_retries=3, timeout=60):
+        self.cookies = {c.name: c.value for c in cookies}
+        self.headers = {"User-Agent": user_agent, "Accept": "application/json"}
+        self.year = year
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.total_count = 0
+        self.total_pages = 0
+        self.failed_pages = []
+
+    async def _fetch_page(self, session, sem, page):
+        url = build_url(page=page, page_size=self.page_size, year=self.year)
+        async with sem:
+            for attempt in range(1, self.max_retries + 1):
+                try:
+                    async with session.get(url) as resp:
+                        resp.raise_for_status()
+                        # API kadang mengirim text/html walau isinya JSON
+                        return page, await resp.json(content_type=None)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    log(f"FAIL: listing page {page} | {e} (attempt {attempt})")
+                    if attempt == self.max_retries:
+                        self.failed_pages.append({"Page": page, "Reason": str(e)})
+                        return page, None
+                    await asyncio.sleep(2 ** attempt)
+
+    @staticmethod
+    def _records(data):
+        for r in data.get("Results", []):
+            yield ListingRecord(
+                KodeEmiten=r.get("KodeEmiten"),
+                NamaEmiten=r.get("NamaEmiten"),
+                Report_Year=r.get("Report_Year"),
+                Attachments=r.get("Attachments", []) or [],
+            )
+
+    async def records(self, first_page=None):
+        """
+        Async generator ListingRecord. `first_page` = JSON halaman 1 kalau
+        sudah diambil (misalnya lewat browser), supaya tidak diambil ulang.
+        """
+        sem = asyncio.Semaphore(self.concurrency)
+        async with aiohttp.ClientSession(cookies=self.cookies, headers=self.headers,
+                                         timeout=self.timeout) as session:
+            if first_page is None:
+                _, first_page = await self._fetch_page(session, sem, 1)
+                if first_page is None:
+                    return
+
+            self.total_count = int(first_page.get("ResultCount", 0))
+            self.total_pages = max(1, math.ceil(self.total_count / self.page_size))
+            log(f"Total data: {self.total_count} | Page size: {self.page_size} | Total pages: {self.total_pages}")
+
+            for rec in self._records(first_page):
+                yield rec
+
+            tasks = [asyncio.ensure_future(self._fetch_page(session, sem, page))
+                     for page in range(2, self.total_pages + 1)]
+            try:
+                for fut in asyncio.as_completed(tasks):
+                    page, data = await fut
+                    if data is None:
+                        continue
+                    log(f"LISTING: page {page}/{self.total_pages}")
+                    for rec in self._records(data):
+                        yield rec
+            finally:
+                for t in tasks:
+                    t.cancel()
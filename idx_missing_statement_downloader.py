@@ -1,19 +1,18 @@
 import os
 import time
-import zipfile
 import pandas as pd
 import undetected_chromedriver as uc
-from datetime import datetime
-
-BASE_URL = "https://www.idx.co.id"
 
+from idx_download_engine import (
+    BrowserDownloader, DownloadPool, DownloadTask, cookies_from_driver, log
+)
+from idx_download_manifest import DownloadManifest
+from idx_download_watcher import DownloadWatcher
 
-def log(msg):
-    ts = datetime.now().strftime("%H:%M:%S")
-    print(f"[{ts}] {msg}")
+BASE_URL = "https://www.idx.co.id"
 
 
-# Setup driver
+# Setup driver (session cookies + fallback when HTTP is refused)
 download_root = os.path.abspath("data")  # download path
 os.makedirs(download_root, exist_ok=True)
 
@@ -29,18 +28,30 @@ prefs = {
 options.add_experimental_option("prefs", prefs)
 
 driver = uc.Chrome(version_main=139, options=options)
+driver.get(BASE_URL)
+time.sleep(15)
+cookies, user_agent = cookies_from_driver(driver)
+
+watcher = DownloadWatcher(download_root)
+log(f"Download watcher: {watcher.backend}")
+# manifest sendiri untuk pohon missing_data/ (data utama: ./download_manifest.sqlite)
+manifest = DownloadManifest(os.path.join("missing_data", "download_manifest.sqlite"))
+workers = 8  # Parallel download workers
+extract_zips = True  # False: keep instance.zip only, read it with xbrl_to_json.py --zip
+
+pool = DownloadPool(
+    cookies, user_agent, workers=workers, manifest=manifest,
+    fallback=BrowserDownloader(driver, watcher), extract=extract_zips
+)
 
 
 # Load data
 missing_df = pd.read_csv("missing_files.csv")
 missing = list(zip(missing_df["KodeEmiten"], missing_df["Year"]))
 
-failed_files = []
-
 # Loop task
 for kode, year in missing:
     save_dir = os.path.join("missing_data", str(year), kode)
-    os.makedirs(save_dir, exist_ok=True)
 
     # Set targets
     targets = [
@@ -55,77 +66,18 @@ for kode, year in missing:
     ]
 
     for url_download, fname in targets:
-        dst_path = os.path.join(save_dir, fname)
-        if os.path.exists(dst_path):
-            log(f"SKIP (already exists): {dst_path}")
-            continue
-
-        max_retries = 3
-        attempt = 0
-        success = False
-
-        while attempt < max_retries and not success:
-            attempt += 1
-            log(f"DOWNLOAD (attempt {attempt}): {fname} -> {url_download}")
-            driver.get(url_download)
-            time.sleep(3)
-
-            src_path = os.path.join(download_root, fname)
-            timeout = 120
-            interval = 2
-            waited = 0
-            while not os.path.exists(src_path) and waited < timeout:
-                time.sleep(interval)
-                waited += interval
-                if waited % 30 == 0:
-                    log(f"Still waiting for {fname}... ({waited}s)")
-
-            if not os.path.exists(src_path):
-                log(f"FAIL: {fname} did not appear after {timeout}s (attempt {attempt})")
-                if attempt < max_retries:
-                    continue
-                else:
-                    failed_files.append({
-                        "File": fname,
-                        "Company": kode,
-                        "Year": year,
-                        "Reason": "Not found after retries"
-                    })
-                    break
-
-            try:
-                os.replace(src_path, dst_path)
-                log(f"DONE: {fname} -> {dst_path}")
-                success = True
-                time.sleep(2)
-
-                # Unzip
-                if fname.lower().endswith(".zip"):
-                    try:
-                        extract_dir = os.path.join(
-                            save_dir, fname.replace(".zip", ""))
-                        os.makedirs(extract_dir, exist_ok=True)
-                        with zipfile.ZipFile(dst_path, 'r') as zip_ref:
-                            zip_ref.extractall(extract_dir)
-                        log(f"EXTRACT: {fname} -> {extract_dir}")
-                    except Exception as e:
-                        log(f"ERR-UNZIP: {fname} | {e}")
-                        failed_files.append({
-                            "File": fname,
-                            "Company": kode,
-                            "Year": year,
-                            "Reason": f"Unzip error: {e}"
-                        })
-
-            except Exception as e:
-                log(f"ERROR: {fname} | {e}")
-                failed_files.append({
-                    "File": fname,
-                    "Company": kode,
-                    "Year": year,
-                    "Reason": str(e)
-                })
-                break
+        pool.submit(DownloadTask(
+            code=kode,
+            year=year,
+            fname=fname,
+            url=url_download,
+            save_dir=save_dir,
+        ))
+
+failed_files = pool.join()
+driver.quit()
+watcher.close()
+manifest.close()
 
 # Summary
 if failed_files:
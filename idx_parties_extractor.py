@@ -1,11 +1,15 @@
 import json
 import os
 
+from xbrl_pipeline.json_io import document_files, load_document
+from xbrl_pipeline.key_index import KeyIndex, load_fragments
+
 base_folder = "data_perusahaan_json/json"
 current_year = 2024
 prior_year = current_year - 1
 year_folder = os.path.join(base_folder, str(current_year))
 output_file = f"pihak_berelasi_{current_year}.json"
+use_index = True  # baca lewat key_index.sqlite (hanya fragmen yang dipakai), False: parse semua file
 
 # Set target fields
 target_fields = [
@@ -55,27 +59,54 @@ def extract_entities(items, label, kodeEmiten):
         })
 
 
-# Loop each file
-for fname in os.listdir(year_folder):
-    if not fname.endswith("_instance.json"):
-        continue
+def wanted(key):
+    return key.startswith("@xmlns") or key in target_fields
+
+
+def read_members(files):
+    """(fname, {key: value} member xbrl yang dipakai, atau Exception)"""
+    if not use_index:
+        for filepath in files:
+            try:
+                xbrl = load_document(filepath).get("xbrl", {})
+                yield filepath.name, {k: v for k, v in xbrl.items() if wanted(k)}
+            except Exception as e:
+                yield filepath.name, e
+        return
+
+    errors = {}
+
+    def report(name, n_fragments, err):
+        if err is not None:
+            errors[name] = err
 
-    filepath = os.path.join(year_folder, fname)
+    idx = KeyIndex.for_folder(year_folder)
+    idx.update(on_file=report)
+    names = [f.name for f in files]
+    rows = [r for r in idx.find(files=names) if r["root"] == "xbrl" and wanted(r["key"])]
+    idx.close()
+
+    members = {name: {} for name in names if name not in errors}
+    for row, value in load_fragments(year_folder, rows):
+        members[row["file"]][row["key"]] = value
+    for name in names:
+        yield name, members[name] if name in members else ValueError(errors[name])
+
+
+# Loop each file ({KodeEmiten}_{Year}_instance.json / .msgpack.zst)
+for fname, xbrl in read_members(document_files(year_folder, "_instance")):
     kodeEmiten = fname.split("_")[0]
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if isinstance(xbrl, Exception):
+            raise xbrl
 
         # Check namespace
-        namespaces = [v for k, v in data.get(
-            "xbrl", {}).items() if k.startswith("@xmlns")]
+        namespaces = [v for k, v in xbrl.items() if k.startswith("@xmlns")]
         if "http://www.idx.co.id/xbrl/taxonomy/2020-01-01/cor" not in namespaces:
             print(f"Namespace 'idx-cor' not found in {fname}, skipped.")
             continue
 
-        xbrl = data.get("xbrl", {})
-
         # Extract each target field
         for field in target_fields:
             items = xbrl.get(field, [])
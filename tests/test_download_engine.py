@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""DownloadPool: conditional re-download (ETag/304) per pohon tujuan."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root -> idx_download_engine
+
+from idx_download_engine import DownloadPool, DownloadTask
+from idx_download_manifest import DownloadManifest
+
+URL = "https://www.idx.co.id/Portals/0/StaticData/AALI/FinancialStatement-2024-Tahunan-AALI.pdf"
+FNAME = "FinancialStatement-2024-Tahunan-AALI.pdf"
+
+
+def pdf(version):
+    return b"%PDF-1.4\n" + version.encode() * 50 + b"\n%%EOF\n"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+
+class FakeServer:
+    """Satu attachment dengan versi yang bisa diganti; catat header tiap request"""
+
+    def __init__(self):
+        self.version = "v1"
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        headers = headers or {}
+        self.requests.append(headers)
+        etag = f'"{self.version}"'
+        if headers.get("If-None-Match") == etag:
+            return FakeResponse(304)
+        body = pdf(self.version)
+        return FakeResponse(200, body, {"ETag": etag, "Content-Length": str(len(body))})
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+def make_pool(server, manifest_path):
+    manifest = DownloadManifest(str(manifest_path))
+    pool = DownloadPool({}, "test-agent", workers=1, manifest=manifest)
+    pool._session = lambda: server
+    return pool, manifest
+
+
+def run_task(pool, save_dir):
+    pool._run(DownloadTask("AALI", 2024, FNAME, URL, str(save_dir)))
+    assert pool.failed_files == []
+    return (Path(save_dir) / FNAME).read_bytes()
+
+
+def test_revalidation_uses_own_validators_per_destination(tmp_path, server):
+    # seperti idx_statement_downloader.py dan idx_missing_statement_downloader.py
+    data_pool, data_manifest = make_pool(server, tmp_path / "download_manifest.sqlite")
+    miss_pool, miss_manifest = make_pool(server, tmp_path / "missing_data" / "download_manifest.sqlite")
+    data_dir = tmp_path / "2024" / "AALI"
+    miss_dir = tmp_path / "missing_data" / "2024" / "AALI"
+    try:
+        assert run_task(data_pool, data_dir) == pdf("v1")
+        server.version = "v2"
+        assert run_task(miss_pool, miss_dir) == pdf("v2")
+
+        # data/ masih v1: harus revalidasi dengan ETag-nya sendiri dan dapat v2
+        assert run_task(data_pool, data_dir) == pdf("v2")
+        assert server.requests[-1].get("If-None-Match") == '"v1"'
+
+        # tidak berubah lagi: keduanya 304 dengan ETag masing-masing, file tetap
+        for pool, save_dir in ((data_pool, data_dir), (miss_pool, miss_dir)):
+            assert run_task(pool, save_dir) == pdf("v2")
+            assert server.requests[-1].get("If-None-Match") == '"v2"'
+        assert len(server.requests) == 5
+    finally:
+        data_manifest.close()
+        miss_manifest.close()
+
+
+def test_corrupt_local_file_is_fetched_again(tmp_path, server):
+    pool, manifest = make_pool(server, tmp_path / "download_manifest.sqlite")
+    save_dir = tmp_path / "2024" / "AALI"
+    try:
+        run_task(pool, save_dir)
+        (save_dir / FNAME).write_bytes(pdf("v1").replace(b"v", b"w", 1))  # ukuran sama, isi rusak
+        assert run_task(pool, save_dir) == pdf("v1")
+        assert "If-None-Match" not in server.requests[-1]
+    finally:
+        manifest.close()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""DownloadManifest: verifikasi ukuran/sha256 dan baris milik path lain."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root -> idx_download_manifest
+
+from idx_download_manifest import DownloadManifest
+
+PDF = b"%PDF-1.4\n" + b"x" * 100 + b"\n%%EOF\n"
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    m = DownloadManifest(str(tmp_path / "download_manifest.sqlite"))
+    yield m
+    m.close()
+
+
+def test_corrupt_file_with_same_size_fails_hash_check(tmp_path, manifest):
+    path = tmp_path / "FinancialStatement-2024.pdf"
+    path.write_bytes(PDF)
+    manifest.record_download("AALI", 2024, path.name, "https://x/a.pdf", str(path), etag='"v1"')
+
+    path.write_bytes(PDF.replace(b"x", b"y", 1))  # ukuran sama, isi rusak
+    assert manifest.is_verified("AALI", 2024, path.name, str(path))
+    assert not manifest.is_verified("AALI", 2024, path.name, str(path), verify_hash=True)
+
+
+def test_row_for_other_destination_is_not_used(tmp_path, manifest):
+    fname = "FinancialStatement-2024.pdf"
+    data_file = tmp_path / "2024" / "AALI" / fname
+    missing_file = tmp_path / "missing_data" / "2024" / "AALI" / fname
+    for p, body in ((data_file, PDF), (missing_file, PDF + b"extra")):
+        p.parent.mkdir(parents=True)
+        p.write_bytes(body)
+
+    manifest.record_download("AALI", 2024, fname, "https://x/a.pdf", str(missing_file), etag='"missing"')
+    # baris milik missing_data/: validator-nya tidak boleh dipakai untuk data/
+    assert manifest.is_verified("AALI", 2024, fname, str(data_file), verify_hash=True)
+    entry = manifest.get("AALI", 2024, fname)
+    assert entry["path"] == str(data_file)
+    assert entry["etag"] is None
+    assert entry["size"] == len(PDF)
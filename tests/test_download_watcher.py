@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""DownloadWatcher: selesai/macet dengan partial .crdownload sisa sesi lama."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root -> idx_download_watcher
+
+from idx_download_watcher import DownloadError, DownloadWatcher
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    w = DownloadWatcher(str(tmp_path), poll_interval=0.05)
+    yield w
+    w.close()
+
+
+def test_stale_partial_does_not_block_finished_file(tmp_path, watcher):
+    (tmp_path / 'Unconfirmed 123.crdownload').write_bytes(b'x' * 10)
+    stale = watcher.snapshot()
+    (tmp_path / 'report.pdf').write_bytes(b'%PDF-1.4')
+
+    start = time.monotonic()
+    path = watcher.wait_for('report.pdf', timeout=5, stall_timeout=1, ignore=stale)
+    assert path == str(tmp_path / 'report.pdf')
+    assert time.monotonic() - start < 1
+
+
+def test_new_partial_finishes_after_rename(tmp_path, watcher):
+    stale = watcher.snapshot()
+    partial = tmp_path / 'Unconfirmed 456.crdownload'
+    partial.write_bytes(b'x' * 10)
+
+    def finish():
+        time.sleep(0.2)
+        partial.rename(tmp_path / 'instance.zip')
+
+    t = threading.Thread(target=finish)
+    t.start()
+    try:
+        path = watcher.wait_for('instance.zip', timeout=5, stall_timeout=2, ignore=stale)
+    finally:
+        t.join()
+    assert path == str(tmp_path / 'instance.zip')
+
+
+def test_new_partial_without_progress_is_stalled(tmp_path, watcher):
+    (tmp_path / 'Unconfirmed 123.crdownload').write_bytes(b'old')
+    stale = watcher.snapshot()
+    (tmp_path / 'Unconfirmed 789.crdownload').write_bytes(b'x' * 10)
+    with pytest.raises(DownloadError, match='Stalled at 10 bytes'):
+        watcher.wait_for('instance.zip', timeout=5, stall_timeout=0.3, ignore=stale)
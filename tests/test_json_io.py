@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Round-trip dokumen JSON hasil konversi untuk semua format json_io."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root -> xbrl_pipeline
+
+from xbrl_pipeline.json_io import (FORMATS, DocumentWriter, document_files, document_path,
+                                   document_stem, dump_document, load_document)
+
+# format -> paket opsional yang dibutuhkan
+REQUIRES = {'pretty': [], 'compact': [], 'orjson': ['orjson'], 'msgpack': ['msgpack', 'zstandard']}
+
+SAMPLE = {
+    'xbrl': {
+        '@xmlns:xbrli': 'http://www.xbrl.org/2003/instance',
+        '@xmlns:idx-cor': 'http://www.idx.co.id/xbrl/taxonomy/2020-01-01/cor',
+        'link:schemaRef': {'@xlink:type': 'simple', '@xlink:href': 'idx-cor.xsd'},
+        'xbrli:context': [
+            {'@id': 'CurrentYearInstant',
+             'xbrli:entity': {'xbrli:identifier': {'@scheme': 'http://www.idx.co.id', '#text': 'AALI'}},
+             'xbrli:period': {'xbrli:instant': '2024-12-31'}},
+            {'@id': 'PriorYearInstant',
+             'xbrli:entity': {'xbrli:identifier': {'@scheme': 'http://www.idx.co.id', '#text': 'AALI'}},
+             'xbrli:period': {'xbrli:instant': '2023-12-31'}},
+        ],
+        'idx-cor:EntityName': {'@contextRef': 'CurrentYearInstant', '#text': 'PT Astra Agro Lestari Tbk'},
+        'idx-cor:PartyName': {'@contextRef': 'CurrentYearInstant', '#text': 'Koperasi "Karyawan" \\ é – 株'},
+        'idx-cor:Nil': None,
+        'idx-cor:Empty': [],
+    }
+}
+
+
+def _skip_missing(fmt):
+    for mod in REQUIRES[fmt]:
+        if importlib.util.find_spec(mod) is None:
+            pytest.skip(f"format {fmt} butuh paket '{mod}'")
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_dump_document_roundtrip(tmp_path, fmt):
+    _skip_missing(fmt)
+    path = dump_document(SAMPLE, tmp_path / 'AALI_2024_instance', fmt)
+    assert path == document_path(tmp_path / 'AALI_2024_instance', fmt)
+    assert load_document(path) == SAMPLE
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_document_writer_matches_dump(tmp_path, fmt):
+    _skip_missing(fmt)
+    root, members = next(iter(SAMPLE.items()))
+    writer = DocumentWriter(tmp_path / 'streamed', fmt)
+    writer.root = root
+    for key, value in members.items():
+        # tag berulang ditulis satu per satu, hasilnya list seperti xmltodict
+        for item in value if key == 'xbrli:context' else [value]:
+            writer.add(key, item)
+    path = writer.close()
+    assert load_document(path) == SAMPLE
+
+    if fmt in ('pretty', 'compact', 'orjson'):
+        dumped = dump_document(SAMPLE, tmp_path / 'dumped', fmt)
+        assert path.read_bytes() == dumped.read_bytes()
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_document_writer_without_members(tmp_path, fmt):
+    _skip_missing(fmt)
+    writer = DocumentWriter(tmp_path / 'empty', fmt)
+    writer.root = 'xbrl'
+    assert load_document(writer.close()) == {'xbrl': None}
+
+
+def test_document_files(tmp_path):
+    for fmt in ('pretty', 'compact'):
+        dump_document(SAMPLE, tmp_path / f"{fmt.upper()}_2024_instance", fmt)
+    (tmp_path / 'notes.txt').write_text('bukan dokumen')
+    files = document_files(tmp_path, stem_suffix='_instance')
+    assert [document_stem(f.name) for f in files] == ['COMPACT_2024_instance', 'PRETTY_2024_instance']
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Sumber input pipeline konversi (sources.py): nama base per sumber."""
+
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root -> xbrl_pipeline
+
+from xbrl_pipeline.collector import StructuredXBRLCollector
+from xbrl_pipeline.sources import collect_inputs
+
+INSTANCE = '<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance"/>'
+
+
+@pytest.fixture
+def download_tree(tmp_path):
+    """data/{Year}/{Company}/instance/instance.xbrl untuk AALI dan BBCA"""
+    root = tmp_path / 'data'
+    for company in ('AALI', 'BBCA'):
+        instance_dir = root / '2024' / company / 'instance'
+        instance_dir.mkdir(parents=True)
+        (instance_dir / 'instance.xbrl').write_text(INSTANCE, encoding='utf-8')
+    return root
+
+
+@pytest.mark.parametrize('view', ['flat', 'organized'])
+def test_manifest_bases_are_unique_per_company(download_tree, tmp_path, view):
+    collector = StructuredXBRLCollector(str(download_tree))
+    data = collector.scan_structured_directory(workers=1)
+    out = tmp_path / view
+    if view == 'flat':
+        collector.create_flat_copy(data, str(out), mode='manifest')
+    else:
+        collector.create_organized_copy(data, str(out), mode='manifest')
+
+    inputs = collect_inputs(out, source='manifest')
+    assert sorted(inp.base for inp in inputs) == ['AALI_2024_instance', 'BBCA_2024_instance']
+    assert sorted(inp.name for inp in inputs) == ['AALI_2024_instance.xbrl', 'BBCA_2024_instance.xbrl']
+    assert all(Path(inp.path).is_file() for inp in inputs)
+
+
+def test_manifest_duplicate_base_is_rejected(tmp_path):
+    log = {'copied_files': [
+        {'original': '/data/2024/AALI/instance/instance.xbrl', 'new': '/view/instance.xbrl'},
+        {'original': '/data/2024/BBCA/instance/instance.xbrl', 'new': '/other/instance.xbrl'},
+    ]}
+    (tmp_path / 'copy_log.json').write_text(json.dumps(log), encoding='utf-8')
+    with pytest.raises(ValueError):
+        collect_inputs(tmp_path, source='manifest')
+
+
+def test_corrupt_zip_is_reported_and_skipped(tmp_path):
+    good = tmp_path / '2024' / 'AALI' / 'instance.zip'
+    bad = tmp_path / '2024' / 'BBCA' / 'instance.zip'
+    good.parent.mkdir(parents=True)
+    bad.parent.mkdir(parents=True)
+    with zipfile.ZipFile(good, 'w') as zf:
+        zf.writestr('instance.xbrl', INSTANCE)
+    bad.write_bytes(good.read_bytes()[:40])  # download terpotong
+
+    errors = []
+    inputs = collect_inputs(tmp_path, source='zip', errors=errors)
+    assert [(inp.base, inp.member) for inp in inputs] == [('AALI_2024_instance', 'instance.xbrl')]
+    assert [label for label, _ in errors] == [str(bad)]
@@ -0,0 +1,4 @@
+"""
+Shared library code for the XBRL pipeline (xbrl_to_json, analysis scripts).
+Scripts outside the repo root add the repo root to sys.path before importing.
+"""
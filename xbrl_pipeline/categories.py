@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klasifikasi kategori dari nama tag XBRL (mis. related party: receivables,
+payables, ...) dengan automaton Aho-Corasick yang dibangun sekali dari
+mapping {kategori: [pola substring]}.
+
+Aturan sama dengan loop lama: key dibersihkan dari prefix ('idx-cor:X' -> 'X'),
+kategori pertama (urutan mapping) yang salah satu polanya muncul di key
+menang, selain itu 'other'. Satu kali jalan per key (bukan key x pola), dan
+hasil per key unik disimpan di LRU memo.
+
+    clf = CategoryClassifier.from_file('related_party_categories.json')
+    clf.classify_one('idx-cor:TradeReceivablesRelatedParties')  # 'receivables'
+    clf.classify(keys)                                           # list kategori
+
+Format file (JSON, urutan kategori = prioritas):
+
+    {"receivables": ["TradeReceivablesRelatedParties", ...], "payables": [...]}
+"""
+
+import json
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+
+DEFAULT_CATEGORY = 'other'
+
+
+def load_category_mapping(path):
+    """Baca mapping kategori dari file JSON {kategori: [pola, ...]}"""
+    with open(path, encoding='utf-8') as f:
+        mapping = json.load(f)
+    if not isinstance(mapping, dict) or not all(
+        isinstance(k, str) and isinstance(v, list) and all(isinstance(p, str) for p in v)
+        for k, v in mapping.items()
+    ):
+        raise ValueError(f"{Path(path).name}: harus berisi {{kategori: [pola, ...]}}")
+    return mapping
+
+
+def clean_key(key):
+    """'idx-cor:TradeReceivables' -> 'TradeReceivables'"""
+    return key.rsplit(':', 1)[-1]
+
+
+class CategoryClassifier:
+    """Automaton Aho-Corasick atas semua pola, output = peringkat kategori terbaik"""
+
+    def __init__(self, mapping, default=DEFAULT_CATEGORY, memo_size=65536):
+        self.categories = list(mapping)
+        self.default = default
+        self._goto = [{}]
+        self._fail = [0]
+        self._rank = [None]  # peringkat kategori terkecil yang polanya berakhir di state ini
+
+        for rank, patterns in enumerate(mapping.values()):
+            for pattern in patterns:
+                state = 0
+                for ch in pattern:
+                    nxt = self._goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._rank.append(None)
+                        self._goto[state][ch] = nxt
+                    state = nxt
+                self._rank[state] = _better(self._rank[state], rank)
+
+        # fail link (BFS), rank diwariskan lewat fail link (pola yang jadi suffix)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0) if state else 0
+                self._rank[nxt] = _better(self._rank[nxt], self._rank[self._fail[nxt]])
+
+        self.classify_one = lru_cache(maxsize=memo_size)(self._classify)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        return cls(load_category_mapping(path), **kwargs)
+
+    def _classify(self, key):
+        goto, fail, ranks = self._goto, self._fail, self._rank
+        best = ranks[0]  # pola kosong cocok dengan semua key
+        state = 0
+        for ch in clean_key(key):
+            if best == 0:
+                break  # kategori pertama, tidak mungkin lebih baik
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            best = _better(best, ranks[state])
+        return self.default if best is None else self.categories[best]
+
+    def classify(self, keys):
+        """Kategori untuk banyak key sekaligus (urutan sama dengan input)"""
+        classify_one = self.classify_one
+        return [classify_one(key) for key in keys]
+
+
+def _better(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
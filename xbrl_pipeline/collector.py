@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Structured XBRL File Collector
+For directory structure: Year/Company/instance/file.xbrl
+Dipakai oleh xbrl_to_json/xbrl_collector.py (data_perusahaan) dan
+xbrl_to_json_missing_data/xbrl_collect_missing.py (missing_data).
+"""
+
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import json
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+
+COPY_LOG = "copy_log.json"
+
+# Cara file dibuat di folder output:
+#   copy      salinan penuh (shutil.copy2, default)
+#   hardlink  hard link (os.link), fallback copy kalau beda filesystem
+#   reflink   clone copy-on-write (FICLONE: btrfs/XFS/...), fallback copy
+#   symlink   symbolic link ke file asli (path absolut)
+#   manifest  tidak membuat file, hanya dicatat di copy_log.json
+MATERIALIZE_MODES = ["copy", "hardlink", "reflink", "symlink", "manifest"]
+MODE_LABELS = {
+    "copy": "Copied", "hardlink": "Linked", "reflink": "Cloned",
+    "symlink": "Symlinked", "manifest": "Listed",
+}
+FICLONE = 0x40049409  # linux/fs.h
+
+
+def reflink(src: Path, dst: Path):
+    import fcntl  # Linux / Unix saja
+    with open(src, 'rb') as fs, open(dst, 'wb') as fd:
+        fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+    shutil.copystat(src, dst)
+
+
+def materialize(src: Path, dst: Path, mode: str = "copy") -> str:
+    """Buat dst dari src sesuai mode, return mode yang benar-benar dipakai"""
+    if mode == "copy":
+        shutil.copy2(src, dst)
+    elif mode == "hardlink":
+        try:
+            os.link(src, dst)
+        except OSError:  # beda device / filesystem tanpa hard link
+            shutil.copy2(src, dst)
+            return "copy"
+    elif mode == "reflink":
+        try:
+            reflink(src, dst)
+        except (OSError, ImportError):  # filesystem tanpa reflink
+            if os.path.lexists(dst):
+                os.unlink(dst)
+            shutil.copy2(src, dst)
+            return "copy"
+    elif mode == "symlink":
+        os.symlink(os.path.abspath(src), dst)
+    elif mode != "manifest":
+        raise ValueError(f"Unknown mode: {mode} (choices: {', '.join(MATERIALIZE_MODES)})")
+    return mode
+
+
+def claim_name(taken: set, name: str, alternative) -> str:
+    """Nama unik dalam `taken` (nama yang sudah ada/dipakai di folder), alternative(n) untuk duplikat"""
+    counter = 1
+    while name in taken:
+        name = alternative(counter)
+        counter += 1
+    taken.add(name)
+    return name
+
+
+class StructuredXBRLCollector:
+    def __init__(self, base_path: str, output_root: Optional[str] = None):
+        self.base_path = Path(base_path)
+        self.output_root = Path(output_root) if output_root else None
+        self.xbrl_extensions = ['.xbrl', '.xml']
+
+    def _ensure_output_path(self, output_dir: str) -> Path:
+        """
+        Output dir absolut dipakai apa adanya; relatif diletakkan di bawah
+        output_root (kalau diisi) atau working dir.
+        """
+        out = Path(output_dir)
+        if not out.is_absolute() and self.output_root is not None:
+            out = self.output_root / out
+        out.mkdir(parents=True, exist_ok=True)
+        return out
+        
+    def scan_structured_directory(self, workers: int = 8) -> Dict[str, Any]:
+        """
+        Scan the structured directory (Year/Company/instance/file.xbrl)
+
+        Pakai os.scandir (tipe entry dari DirEntry, satu stat per file) dan
+        thread pool per folder year lalu per folder company; berguna di
+        network share. Hasil (dan urutannya) sama dengan scan berurutan.
+        """
+        print(f"Scanning structured directory: {self.base_path}")
+        
+        collected_data = {
+            'scan_date': datetime.now().isoformat(),
+            'base_path': str(self.base_path),
+            'years': {},
+            'companies': {},
+            'all_files': [],
+            'statistics': {
+                'total_files': 0,
+                'total_companies': 0,
+                'total_years': 0,
+                'companies_per_year': {},
+                'files_per_company': {}
+            }
+        }
+        
+        if not self.base_path.exists():
+            print(f"Error: Base path does not exist: {self.base_path}")
+            return collected_data
+        
+        year_entries = self._list_dirs(str(self.base_path))
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Company directories per year, then instance files per company (paralel)
+            company_lists = list(pool.map(self._list_dirs, [y.path for y in year_entries]))
+            company_jobs = [
+                [pool.submit(self._scan_instance_dir, os.path.join(c.path, 'instance')) for c in companies]
+                for companies in company_lists
+            ]
+            
+            for year_entry, companies, jobs in zip(year_entries, company_lists, company_jobs):
+                year_name = year_entry.name
+                print(f"Processing year: {year_name}")
+                
+                collected_data['years'][year_name] = {
+                    'companies': {},
+                    'file_count': 0
+                }
+                
+                for company_entry, job in zip(companies, jobs):
+                    company_name = company_entry.name
+                    print(f"  Processing company: {company_name}")
+                    
+                    xbrl_files = job.result()
+                    if xbrl_files is None:
+                        print(f"    Warning: No 'instance' directory found in {Path(company_entry.path)}")
+                        continue
+                    
+                    if xbrl_files:
+                        # Initialize company data if not exists
+                        if company_name not in collected_data['companies']:
+                            collected_data['companies'][company_name] = {}
+                        
+                        collected_data['companies'][company_name][year_name] = xbrl_files
+                        collected_data['years'][year_name]['companies'][company_name] = xbrl_files
+                        collected_data['years'][year_name]['file_count'] += len(xbrl_files)
+                        
+                        # Add to all_files list
+                        for file_info in xbrl_files:
+                            file_info['year'] = year_name
+                            file_info['company'] = company_name
+                            collected_data['all_files'].append(file_info)
+                        
+                        print(f"    Found {len(xbrl_files)} XBRL files")
+                    else:
+                        print(f"    No XBRL files found in {Path(company_entry.path) / 'instance'}")
+        
+        # Calculate statistics
+        collected_data['statistics']['total_files'] = len(collected_data['all_files'])
+        collected_data['statistics']['total_companies'] = len(collected_data['companies'])
+        collected_data['statistics']['total_years'] = len(collected_data['years'])
+        
+        for year, year_data in collected_data['years'].items():
+            collected_data['statistics']['companies_per_year'][year] = len(year_data['companies'])
+        
+        for company, company_data in collected_data['companies'].items():
+            collected_data['statistics']['files_per_company'][company] = sum(
+                len(files) for files in company_data.values()
+            )
+        
+        return collected_data
+    
+    @staticmethod
+    def _list_dirs(path: str) -> List[os.DirEntry]:
+        """Subfolder langsung (DirEntry, is_dir dari d_type tanpa stat tambahan)"""
+        try:
+            with os.scandir(path) as it:
+                return [e for e in it if e.is_dir()]
+        except OSError as e:
+            print(f"Error reading directory {path}: {e}")
+            return []
+    
+    def _scan_instance_dir(self, instance_dir: str) -> Optional[List[Dict[str, Any]]]:
+        """File XBRL di instance_dir, None kalau folder instance tidak ada"""
+        try:
+            return self.find_xbrl_files_in_instance(Path(instance_dir))
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+    
+    def find_xbrl_files_in_instance(self, instance_dir: Path) -> List[Dict[str, Any]]:
+        """
+        Find all XBRL files in an instance directory (satu stat per file)
+        """
+        xbrl_files = []
+        
+        with os.scandir(instance_dir) as it:
+            for entry in it:
+                extension = os.path.splitext(entry.name)[1].lower()
+                if extension not in self.xbrl_extensions or not entry.is_file():
+                    continue
+                st = entry.stat()
+                file_info = {
+                    'filename': entry.name,
+                    'full_path': entry.path,
+                    'size': st.st_size,
+                    'modified_date': datetime.fromtimestamp(st.st_mtime).isoformat(),
+                    'extension': extension
+                }
+                xbrl_files.append(file_info)
+        
+        return xbrl_files
+    
+    def create_flat_copy(self, collected_data: Dict[str, Any], output_dir: str,
+                         mode: str = "copy") -> str:
+        """
+        Create a flat copy of all XBRL files organized by company-year
+        mode: copy / hardlink / reflink / symlink / manifest (lihat materialize)
+        """
+        output_path = self._ensure_output_path(output_dir)
+        
+        print(f"Creating flat copy in: {output_path} (mode: {mode})")
+        
+        copied_files = []
+        taken = set(os.listdir(output_path))  # cek nama duplikat di memori, bukan stat berulang
+        
+        for file_info in collected_data['all_files']:
+            company = file_info['company']
+            year = file_info['year']
+            original_path = Path(file_info['full_path'])
+            
+            # Create new filename: COMPANY_YEAR_original_filename.xbrl (+ _N kalau duplikat)
+            new_filename = claim_name(
+                taken, f"{company}_{year}_{original_path.name}",
+                lambda n: f"{company}_{year}_{original_path.stem}_{n}{original_path.suffix}"
+            )
+            new_path = output_path / new_filename
+            
+            try:
+                used = materialize(original_path, new_path, mode)
+                copied_files.append({
+                    'original': str(original_path),
+                    'new': str(new_path),
+                    'company': company,
+                    'year': year,
+                    'mode': used
+                })
+                print(f"{MODE_LABELS[used]}: {company} {year} -> {new_filename}")
+            except Exception as e:
+                taken.discard(new_filename)
+                print(f"Error copying {original_path}: {e}")
+        
+        # Save copy log (mode manifest: ini satu-satunya output, dibaca xbrl_to_json.py --source manifest)
+        copy_log_path = output_path / COPY_LOG
+        with open(copy_log_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'copy_date': datetime.now().isoformat(),
+                'mode': mode,
+                'total_copied': len(copied_files),
+                'copied_files': copied_files
+            }, f, indent=2, ensure_ascii=False)
+        
+        print(f"Copied {len(copied_files)} files")
+        print(f"Copy log saved to: {copy_log_path}")
+        
+        return str(output_path)
+    
+    def create_organized_copy(self, collected_data: Dict[str, Any], output_dir: str,
+                              mode: str = "copy") -> str:
+        """
+        Create organized copy maintaining company/year structure
+        mode: copy / hardlink / reflink / symlink / manifest (lihat materialize);
+        manifest tidak membuat folder, hanya copy_log.json di output_dir
+        """
+        output_path = self._ensure_output_path(output_dir)
+        
+        print(f"Creating organized copy in: {output_path} (mode: {mode})")
+        
+        copied_files = []
+        for company, years_data in collected_data['companies'].items():
+            company_dir = output_path / company
+            if mode != "manifest":
+                company_dir.mkdir(parents=True, exist_ok=True)
+            
+            for year, files in years_data.items():
+                year_dir = company_dir / year
+                if mode != "manifest":
+                    year_dir.mkdir(parents=True, exist_ok=True)
+                taken = set(os.listdir(year_dir)) if year_dir.is_dir() else set()
+                
+                for file_info in files:
+                    original_path = Path(file_info['full_path'])
+                    
+                    # Handle duplicates (di memori)
+                    new_path = year_dir / claim_name(
+                        taken, original_path.name,
+                        lambda n: f"{original_path.stem}_{n}{original_path.suffix}"
+                    )
+                    
+                    try:
+                        used = materialize(original_path, new_path, mode)
+                        copied_files.append({
+                            'original': str(original_path),
+                            'new': str(new_path),
+                            'company': company,
+                            'year': year,
+                            'mode': used
+                        })
+                        print(f"{MODE_LABELS[used]}: {company}/{year}/{new_path.name}")
+                    except Exception as e:
+                        taken.discard(new_path.name)
+                        print(f"Error copying {original_path}: {e}")
+        
+        if mode == "manifest":
+            with open(output_path / COPY_LOG, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'copy_date': datetime.now().isoformat(),
+                    'mode': mode,
+                    'total_copied': len(copied_files),
+                    'copied_files': copied_files
+                }, f, indent=2, ensure_ascii=False)
+        
+        return str(output_path)
+    
+    def generate_report(self, collected_data: Dict[str, Any], output_file: str = "xbrl_scan_report.json",
+                        title: str = "SCAN REPORT"):
+        """
+        Generate detailed report of the scan
+        """
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(collected_data, f, indent=2, ensure_ascii=False)
+        
+        print(f"\n=== {title} ===")
+        print(f"Total XBRL files found: {collected_data['statistics']['total_files']}")
+        print(f"Total companies: {collected_data['statistics']['total_companies']}")
+        print(f"Total years: {collected_data['statistics']['total_years']}")
+        
+        print(f"\n=== Files per Year ===")
+        for year, year_data in collected_data['years'].items():
+            print(f"{year}: {year_data['file_count']} files from {len(year_data['companies'])} companies")
+        
+        print(f"\n=== Files per Company ===")
+        for company, count in collected_data['statistics']['files_per_company'].items():
+            years = list(collected_data['companies'][company].keys())
+            print(f"{company}: {count} files across years {', '.join(sorted(years))}")
+        
+        print(f"\nDetailed report saved to: {output_file}")
+        
+        return collected_data
+
+def run_collector(base_directory: str, title: str = "Structured XBRL File Collector",
+                  report_file: str = "xbrl_scan_report.json", report_title: str = "SCAN REPORT",
+                  flat_output: str = "flat_xbrl_files", organized_output: str = "organized_xbrl_files",
+                  output_root: Optional[str] = None, mode: str = "copy"):
+    """Scan + report + menu interaktif flat/organized copy"""
+    print(f"=== {title} ===")
+    print(f"Scanning: {base_directory}")
+    
+    collector = StructuredXBRLCollector(base_directory, output_root=output_root)
+    
+    # Scan the directory
+    scan_results = collector.scan_structured_directory()
+    
+    if scan_results['statistics']['total_files'] == 0:
+        print(f"No XBRL files found in {base_directory}!")
+        return
+    
+    # Generate report
+    collector.generate_report(scan_results, report_file, title=report_title)
+    
+    # Ask user what they want to do
+    print(f"\n=== Options ===")
+    print("1. Create flat copy (all files in one folder with company-year names)")
+    print("2. Create organized copy (maintain company/year folder structure)")
+    print("3. Both")
+    print("4. Just generate report (done)")
+    
+    choice = input("Select option (1-4): ").strip()
+    
+    if choice in ['1', '3']:
+        out_flat = collector.create_flat_copy(scan_results, flat_output, mode=mode)
+        print(f"Flat copy created in: {out_flat}")
+    
+    if choice in ['2', '3']:
+        out_org = collector.create_organized_copy(scan_results, organized_output, mode=mode)
+        print(f"Organized copy created in: {out_org}")
+    
+    print(f"\n=== Summary ===")
+    print(f"Found {scan_results['statistics']['total_files']} XBRL files")
+    print(f"From {scan_results['statistics']['total_companies']} companies")
+    print(f"Across {scan_results['statistics']['total_years']} years")
+    print(f"Report saved as: {report_file}")
+    return scan_results
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache konversi XBRL (SQLite, di folder output): input yang tidak berubah sejak
+konversi terakhir di-skip dan output lamanya dipakai lagi.
+
+Key per input (label = path, atau path!member untuk zip):
+ukuran + mtime + hash isi (sha256, atau CRC32 member zip) + versi converter
++ format dokumen. Ukuran/mtime sama -> langsung dianggap sama (tanpa baca
+file); kalau beda, hash isi dibandingkan (file yang cuma di-touch / zip yang
+di-download ulang dengan isi sama tidak dikonversi ulang).
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+CACHE_NAME = 'conversion_cache.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversions (
+    label      TEXT PRIMARY KEY,
+    size       INTEGER,
+    mtime_ns   INTEGER,
+    digest     TEXT,
+    version    TEXT,
+    fmt        TEXT,
+    facts_csv  TEXT,
+    document   TEXT,
+    part       TEXT,
+    updated_at TEXT
+)
+"""
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return 'sha256:' + h.hexdigest()
+
+
+def stat_of(inp):
+    """(ukuran isi, mtime_ns) tanpa membaca isi file"""
+    st = os.stat(inp.path)
+    if inp.member is None:
+        return st.st_size, st.st_mtime_ns
+    with zipfile.ZipFile(inp.path) as zf:
+        return zf.getinfo(inp.member).file_size, st.st_mtime_ns
+
+
+def digest_of(inp):
+    if inp.member is None:
+        return file_sha256(inp.path)
+    with zipfile.ZipFile(inp.path) as zf:
+        return f"crc32:{zf.getinfo(inp.member).CRC:08x}"
+
+
+class ConversionCache:
+    """Catatan input yang sudah dikonversi + path output-nya"""
+
+    def __init__(self, path, version, fmt='pretty'):
+        self.path = Path(path)
+        self.version = str(version)
+        self.fmt = fmt
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def for_output(cls, out_dir, version, fmt='pretty'):
+        return cls(Path(out_dir) / CACHE_NAME, version, fmt)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get(self, label):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM conversions WHERE label=?", (label,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def fresh(self, inp, need_part=False):
+        """
+        Entri cache kalau input tidak berubah dan semua output-nya masih ada,
+        selain itu None (perlu dikonversi).
+        """
+        entry = self.get(inp.label)
+        if entry is None or entry['version'] != self.version or entry['fmt'] != self.fmt:
+            return None
+        if need_part and entry['part'] is None:  # dulu dikonversi tanpa fact store
+            return None
+        if Path(entry['facts_csv']).name != f"{inp.base}_facts.csv":  # nama output berubah (mis. view manifest)
+            return None
+        outputs = [entry['facts_csv'], entry['document']] + ([entry['part']] if entry['part'] else [])
+        if not all(p and os.path.exists(p) for p in outputs):
+            return None
+        try:
+            size, mtime_ns = stat_of(inp)
+        except (OSError, KeyError, zipfile.BadZipFile):
+            return None
+        if (size, mtime_ns) == (entry['size'], entry['mtime_ns']):
+            return entry
+        if size != entry['size'] or digest_of(inp) != entry['digest']:
+            return None
+        # isi sama, cuma mtime berubah
+        with self._lock:
+            self._conn.execute(
+                "UPDATE conversions SET mtime_ns=?, updated_at=? WHERE label=?",
+                (mtime_ns, datetime.now().isoformat(), inp.label)
+            )
+            self._conn.commit()
+        return entry
+
+    def record(self, inp, facts_csv, document, part=None):
+        """part: path parquet, '' kalau fact store diminta tapi tanpa fakta, None kalau tidak diminta"""
+        size, mtime_ns = stat_of(inp)
+        digest = digest_of(inp)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO conversions "
+                "(label, size, mtime_ns, digest, version, fmt, facts_csv, document, part, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (inp.label, size, mtime_ns, digest, self.version, self.fmt,
+                 str(facts_csv), str(document), None if part is None else str(part),
+                 datetime.now().isoformat())
+            )
+            self._conn.commit()
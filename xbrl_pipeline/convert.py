@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline konversi XBRL -> JSON + facts CSV (+ ALL_facts.csv, fact store
+Parquet + index, cache konversi). Dipakai oleh xbrl_to_json/xbrl_to_json.py
+dan xbrl_to_json_missing_data/xbrl_to_json_missingdata.py; beda keduanya
+hanya sumber input (sources.py) dan letak output.
+"""
+
+import argparse
+import csv
+import os
+import shutil
+from multiprocessing import Pool
+from operator import itemgetter
+from pathlib import Path
+
+from xbrl_pipeline.conversion_cache import ConversionCache
+from xbrl_pipeline.json_io import FORMATS, DocumentWriter, document_path
+from xbrl_pipeline.parser import FACT_COLUMNS, InstanceStream
+from xbrl_pipeline.sources import SOURCES, collect_inputs
+
+# naikkan kalau isi output (JSON/CSV/Parquet) berubah -> cache konversi lama tidak dipakai
+CONVERTER_VERSION = '3'
+
+def build_parser(description="Convert XBRL to JSON and normalized facts CSV.",
+                 input_default=None, out_default='xbrl_out'):
+    p = argparse.ArgumentParser(description=description)
+    if input_default is None:
+        p.add_argument('input_path', help="File .xbrl/.xml (atau .zip dengan --zip) atau folder berisi file-file tersebut")
+    else:
+        p.add_argument('input_path', nargs='?', default=input_default,
+                       help=f"File .xbrl/.xml atau folder berisi file-file tersebut (default: {input_default})")
+    p.add_argument('--out', default=out_default,
+                   help=f"Folder output (default: {out_default})" if out_default else "Folder output")
+    p.add_argument('--source', choices=list(SOURCES), default='files',
+                   help="files: file/folder .xbrl (default), tree: Year/Company/instance/, "
+                        "zip: Year/Company/instance.zip, manifest: copy_log.json dari collector")
+    p.add_argument('--zip', action='store_true',
+                   help="Sama dengan --source zip: baca instance.zip langsung, tanpa extract/flat copy")
+    p.add_argument('--workers', type=int, default=1,
+                   help="Jumlah proses paralel (default: 1)")
+    p.add_argument('--parquet', action='store_true',
+                   help="Tulis juga fact store Parquet terpartisi (year/emiten_code) di <out>/fact_store")
+    p.add_argument('--resume', action='store_true',
+                   help="Lanjutkan run sebelumnya: skip file yang sudah tercatat di ALL_facts.done")
+    p.add_argument('--format', choices=FORMATS, default='pretty',
+                   help="Format dokumen JSON: pretty (default), compact, orjson, msgpack (.msgpack.zst)")
+    p.add_argument('--force', action='store_true',
+                   help="Konversi ulang semua file, abaikan cache konversi di <out>/conversion_cache.sqlite")
+    return p
+
+# ---------- writers ----------
+def write_facts_csv(stream, inp, out_csv):
+    """
+    Tulis fakta dari InstanceStream ke CSV secara streaming. Kode/nama emiten
+    baru pasti setelah seluruh dokumen dibaca, jadi kolomnya ditambahkan di
+    pass kedua atas CSV sementara (jauh lebih murah dari parse XML).
+    """
+    part = Path(f"{out_csv}.part")
+    values = itemgetter(*FACT_COLUMNS)
+    file_col = (inp.name,)
+    try:
+        with open(part, 'w', encoding='utf-8', newline='') as f:
+            w = csv.writer(f, lineterminator='\n')
+            w.writerow(FACT_COLUMNS + ['file'])
+            for r in stream.facts():
+                w.writerow(values(r) + file_col)
+
+        code, name = stream.company_info
+        with open(part, encoding='utf-8', newline='') as fin, \
+             open(out_csv, 'w', encoding='utf-8', newline='') as fout:
+            reader = csv.reader(fin)
+            w = csv.writer(fout, lineterminator='\n')
+            w.writerow(next(reader) + ['emiten_code', 'emiten_name'])
+            for rec in reader:
+                w.writerow(rec + [code, name])
+    finally:
+        # gagal parse -> CSV sementara jangan tertinggal
+        part.unlink(missing_ok=True)
+    return code, name
+
+# ---------- conversion ----------
+def convert_file(inp, out_dir, store_root=None, fmt='pretty', json_dir=None):
+    """
+    Satu file: {base}_facts.csv di out_dir + {base}.json (atau .msgpack.zst,
+    lihat json_io) di json_dir (default out_dir) + partisi Parquet kalau
+    store_root. Dipanggil langsung atau di worker process.
+    Return (label, path facts csv, path parquet atau None, error).
+    """
+    writer = None
+    try:
+        # facts + JSON per file dalam satu parse; JSON ditulis per elemen top-level
+        writer = DocumentWriter(Path(json_dir or out_dir) / inp.base, fmt)
+        stream = InstanceStream(inp, writer)
+
+        facts_csv = Path(out_dir) / f"{inp.base}_facts.csv"
+        write_facts_csv(stream, inp, facts_csv)
+        writer.close()
+
+        part = None
+        if store_root is not None:
+            from xbrl_pipeline.fact_store import write_fact_partition
+            part = write_fact_partition(facts_csv, store_root, inp.base, year=inp.year)
+        return inp.label, str(facts_csv), part, None
+    except Exception as e:
+        if writer is not None:
+            writer.discard()
+        return inp.label, None, None, str(e)
+
+def _convert_task(args):
+    return convert_file(*args)
+
+def iter_conversions(inputs, out_dir, workers=1, store_root=None, fmt='pretty', json_dir=None):
+    """Hasil convert_file per file, urut selesai (bukan urut input) kalau workers > 1"""
+    if workers <= 1:
+        for inp in inputs:
+            yield convert_file(inp, out_dir, store_root, fmt, json_dir)
+        return
+    # maxtasksperchild: worker diganti berkala, memori filing besar tidak menumpuk
+    with Pool(processes=workers, maxtasksperchild=50) as pool:
+        tasks = [(inp, out_dir, store_root, fmt, json_dir) for inp in inputs]
+        yield from pool.imap_unordered(_convert_task, tasks, chunksize=1)
+
+class AllFactsWriter:
+    """
+    ALL_facts.csv append-only. Setelah tiap file: flush + fsync, lalu label
+    input dan offset akhirnya dicatat di ALL_facts.done. Dengan resume=True
+    file dipotong ke offset terakhir yang tercatat (buang tulisan setengah
+    jadi saat crash) dan input yang sudah tercatat bisa di-skip.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix('.done')
+        self.done = set()
+        offset = 0
+        if resume and self.path.exists() and self.journal_path.exists():
+            with open(self.journal_path, encoding='utf-8') as f:
+                for line in f:
+                    label, _, off = line.rstrip('\n').rpartition('\t')
+                    if label:
+                        self.done.add(label)
+                        offset = int(off)
+            self._f = open(self.path, 'r+b')
+            self._f.truncate(offset)
+            self._f.seek(offset)
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        else:
+            self._f = open(self.path, 'wb')
+            self._journal = open(self.journal_path, 'w', encoding='utf-8')
+        self.offset = offset
+
+    def append(self, label, facts_csv):
+        # kolom selalu CSV_COLUMNS, jadi cukup salin byte (header hanya sekali)
+        with open(facts_csv, 'rb') as f:
+            header = f.readline()
+            if self.offset == 0:
+                self._f.write(header)
+            shutil.copyfileobj(f, self._f)
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self.offset = self._f.tell()
+        self._journal.write(f"{label}\t{self.offset}\n")
+        self._journal.flush()
+
+    def close(self):
+        self._f.close()
+        self._journal.close()
+        if self.offset == 0:
+            self.path.unlink()
+            self.journal_path.unlink()
+
+# ---------- main ----------
+def run(args, out_dir, json_dir=None, csv_dir=None):
+    """
+    Konversi semua input dari args (lihat build_parser). JSON ke json_dir,
+    facts CSV + ALL_facts.csv ke csv_dir (keduanya default out_dir);
+    fact_store/ (+ fact_index.sqlite) dan conversion_cache.sqlite di out_dir.
+    """
+    out_dir = Path(out_dir); out_dir.mkdir(parents=True, exist_ok=True)
+    json_dir = Path(json_dir or out_dir); json_dir.mkdir(parents=True, exist_ok=True)
+    csv_dir = Path(csv_dir or out_dir); csv_dir.mkdir(parents=True, exist_ok=True)
+
+    source = 'zip' if args.zip else args.source
+    # arsip zip yang rusak dilaporkan per file seperti error konversi, sisanya jalan terus
+    errors = []
+    inputs = collect_inputs(Path(args.input_path), source=source, errors=errors)
+    for label, err in errors:
+        print(f"[ERROR] {label}: {err}")
+    store_root = out_dir / 'fact_store' if args.parquet else None
+
+    writer = AllFactsWriter(csv_dir / "ALL_facts.csv", resume=args.resume)
+    if writer.done:
+        inputs = [inp for inp in inputs if inp.label not in writer.done]
+        print(f"[RESUME] {len(writer.done)} file sudah ada di ALL_facts.csv, sisa {len(inputs)}")
+
+    # index (emiten, year, concept, period, dimensi) -> baris fact store, diisi di proses utama
+    index = None
+    if store_root is not None:
+        from xbrl_pipeline.fact_index import FactIndex
+        index = FactIndex.for_store(store_root)
+
+    # input yang tidak berubah sejak run terakhir: output lama dipakai lagi
+    cache = ConversionCache.for_output(out_dir, CONVERTER_VERSION, fmt=args.format)
+    by_label = {inp.label: inp for inp in inputs}
+    todo = []
+
+    try:
+        for inp in inputs:
+            entry = None if args.force else cache.fresh(inp, need_part=store_root is not None)
+            if entry is None:
+                todo.append(inp)
+                continue
+            writer.append(inp.label, entry['facts_csv'])
+            print(f"[SKIP] {inp.label} (unchanged)")
+
+        for label, facts_csv, part, err in iter_conversions(todo, csv_dir, workers=args.workers,
+                                                             store_root=store_root, fmt=args.format,
+                                                             json_dir=json_dir):
+            if err is not None:
+                print(f"[ERROR] {label}: {err}")
+                errors.append((label, err))
+                continue
+            if index is not None and part is not None:
+                index.add_partition(part)
+            writer.append(label, facts_csv)
+            inp = by_label[label]
+            if store_root is not None and part is None:
+                part = ''
+            cache.record(inp, facts_csv, document_path(json_dir / inp.base, args.format), part)
+            print(f"[OK] {label}")
+    finally:
+        writer.close()
+        cache.close()
+        if index is not None:
+            index.close()
+
+    if errors:
+        print(f"{len(errors)} file gagal dikonversi.")
+    if writer.offset:
+        print(f"[DONE] ALL_facts.csv -> {csv_dir}")
+    else:
+        print("No facts extracted.")
+    return errors
+
+def main():
+    args = build_parser().parse_args()
+    run(args, args.out)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index fakta (SQLite) di samping fact store: <out>/fact_index.sqlite untuk
+<out>/fact_store (di luar folder store, supaya open_fact_store() hanya
+melihat file parquet).
+
+Memetakan (emiten, year, concept, period, dimension members) -> (part parquet,
+offset baris), diisi saat konversi (xbrl_to_json.py --parquet). Lookup seperti
+"semua idx-cor:PartyName tahun 2024 konteks tahun berjalan" cukup query index
+lalu baca baris yang ditunjuk, tanpa scan JSON/CSV.
+
+    idx = FactIndex.for_store(store_root)
+    hits = idx.lookup(concept='idx-cor:PartyName', year=2024, context_ref='CurrentYear%')
+    table = read_facts(store_root, hits)
+"""
+
+import sqlite3
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from xbrl_pipeline.qname import local_name_of
+
+INDEX_NAME = 'fact_index.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS facts (
+    id            INTEGER PRIMARY KEY,
+    part          TEXT NOT NULL,
+    row           INTEGER NOT NULL,
+    emiten_code   TEXT,
+    year          INTEGER,
+    concept_qname TEXT,
+    local_name    TEXT,
+    period_type   TEXT,
+    period_start  TEXT,
+    period_end    TEXT,
+    instant       TEXT,
+    context_ref   TEXT,
+    dimensions    TEXT
+);
+CREATE TABLE IF NOT EXISTS fact_dims (
+    fact_id   INTEGER NOT NULL,
+    dimension TEXT NOT NULL,
+    member    TEXT
+);
+CREATE INDEX IF NOT EXISTS facts_concept ON facts (local_name, year, emiten_code);
+CREATE INDEX IF NOT EXISTS facts_company ON facts (emiten_code, year);
+CREATE INDEX IF NOT EXISTS facts_part ON facts (part);
+CREATE INDEX IF NOT EXISTS fact_dims_member ON fact_dims (dimension, member);
+CREATE INDEX IF NOT EXISTS fact_dims_fact ON fact_dims (fact_id);
+"""
+
+INDEX_COLUMNS = ['concept_qname', 'local_name', 'period_type', 'period_start',
+                 'period_end', 'instant', 'context_ref', 'dimensions']
+
+
+def split_dimensions(dims):
+    """'dim1=member1|dim2=member2' -> [(dim1, member1), (dim2, member2)]"""
+    if not dims:
+        return []
+    return [tuple(d.split('=', 1)) for d in dims.split('|')]
+
+
+class FactIndex:
+    """Index SQLite atas fact store. Path part disimpan relatif ke root store."""
+
+    def __init__(self, path, store_root=None):
+        self.path = Path(path)
+        self.root = Path(store_root) if store_root is not None else self.path.parent
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def for_store(cls, store_root):
+        store_root = Path(store_root)
+        store_root.mkdir(parents=True, exist_ok=True)
+        return cls(store_root.parent / INDEX_NAME, store_root)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _rel(self, part):
+        part = Path(part)
+        try:
+            return part.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return part.as_posix()
+
+    def add_partition(self, part):
+        """
+        Index satu file parquet .../year=Y/emiten_code=C/part-*.parquet (ganti
+        entri lama untuk part yang sama, jadi konversi ulang / --resume tidak
+        menggandakan).
+        """
+        part = Path(part)
+        rel = self._rel(part)
+        keys = dict(p.split('=', 1) for p in (part.parent.parent.name, part.parent.name) if '=' in p)
+        year = int(keys['year']) if keys.get('year', 'None') != 'None' else None
+        emiten_code = keys.get('emiten_code')
+        table = pq.read_table(part, columns=INDEX_COLUMNS, partitioning=None)
+        cols = {c: table.column(c).cast(pa.string()).to_pylist() for c in INDEX_COLUMNS}
+
+        with self._lock:
+            with self._conn:
+                self._remove(rel)
+                for row in range(table.num_rows):
+                    values = [cols[c][row] for c in INDEX_COLUMNS]
+                    cur = self._conn.execute(
+                        "INSERT INTO facts (part, row, emiten_code, year, " + ', '.join(INDEX_COLUMNS) + ") "
+                        "VALUES (?, ?, ?, ?, " + ', '.join('?' * len(INDEX_COLUMNS)) + ")",
+                        [rel, row, emiten_code, year] + values
+                    )
+                    dims = split_dimensions(cols['dimensions'][row])
+                    if dims:
+                        self._conn.executemany(
+                            "INSERT INTO fact_dims (fact_id, dimension, member) VALUES (?, ?, ?)",
+                            [(cur.lastrowid, d, m) for d, m in dims]
+                        )
+        return table.num_rows
+
+    def _remove(self, rel):
+        self._conn.execute(
+            "DELETE FROM fact_dims WHERE fact_id IN (SELECT id FROM facts WHERE part=?)", (rel,)
+        )
+        self._conn.execute("DELETE FROM facts WHERE part=?", (rel,))
+
+    def remove_partition(self, part):
+        with self._lock:
+            with self._conn:
+                self._remove(self._rel(part))
+
+    def lookup(self, concept=None, emiten_code=None, year=None, context_ref=None,
+               period_end=None, instant=None, dimensions=None):
+        """
+        Cari fakta. `concept` boleh Clark '{ns}Name', 'prefix:Name' atau
+        'Name'; `context_ref` boleh pola LIKE ('CurrentYear%'); `dimensions`
+        dict {dimension: member} (semua harus cocok, member None = apa pun).
+        Return list sqlite3.Row (part, row, emiten_code, year, ...).
+        """
+        where, params = [], []
+        if concept is not None:
+            where.append("local_name = ?")
+            params.append(local_name_of(concept))
+            if concept.startswith('{'):
+                where.append("concept_qname = ?")
+                params.append(concept)
+        if emiten_code is not None:
+            where.append("emiten_code = ?")
+            params.append(emiten_code)
+        if year is not None:
+            where.append("year = ?")
+            params.append(int(year))
+        if context_ref is not None:
+            where.append("context_ref LIKE ?" if '%' in context_ref else "context_ref = ?")
+            params.append(context_ref)
+        if period_end is not None:
+            where.append("period_end = ?")
+            params.append(period_end)
+        if instant is not None:
+            where.append("instant = ?")
+            params.append(instant)
+        for dim, member in (dimensions or {}).items():
+            sub = "SELECT fact_id FROM fact_dims WHERE dimension = ?"
+            params.append(dim)
+            if member is not None:
+                sub += " AND member = ?"
+                params.append(member)
+            where.append(f"id IN ({sub})")
+
+        sql = "SELECT * FROM facts"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY part, row"
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+
+def read_facts(store_root, hits, columns=None):
+    """Baris fact store yang ditunjuk hasil FactIndex.lookup (satu baca per part)"""
+    by_part = defaultdict(list)
+    for h in hits:
+        by_part[h['part']].append(h['row'])
+    tables = []
+    for part, rows in by_part.items():
+        path = Path(part) if Path(part).is_absolute() else Path(store_root) / part
+        table = pq.read_table(path, columns=columns, partitioning=None).take(pa.array(rows))
+        tables.append(table)
+    if not tables:
+        return None
+    return pa.concat_tables(tables)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fact store Parquet terpartisi: <store>/year=YYYY/emiten_code=XXXX/part-<base>.parquet
+Dibangun dari {base}_facts.csv hasil xbrl_to_json.py, dibaca per batch (memori konstan).
+Kolom teks berulang disimpan sebagai dictionary, tanggal sebagai date32,
+nilai numerik sebagai float64 (numeric_value, lihat normalize.py) + is_nil.
+"""
+
+import os
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from xbrl_pipeline.normalize import parse_nil, parse_numeric
+from xbrl_pipeline.parser import CSV_COLUMNS
+
+DICT = pa.dictionary(pa.int32(), pa.string())
+SCHEMA = pa.schema([
+    ('concept_qname', DICT),
+    ('local_name', DICT),
+    ('value', pa.string()),
+    ('numeric_value', pa.float64()),
+    ('is_nil', pa.bool_()),
+    ('unit', DICT),
+    ('decimals', DICT),
+    ('period_type', DICT),
+    ('period_start', pa.date32()),
+    ('period_end', pa.date32()),
+    ('instant', pa.date32()),
+    ('context_ref', DICT),
+    ('entity_identifier', DICT),
+    ('dimensions', DICT),
+    ('file', DICT),
+    ('emiten_name', DICT),
+])
+PARTITIONING = ds.partitioning(
+    pa.schema([('year', pa.int32()), ('emiten_code', pa.string())]), flavor='hive'
+)
+
+BLOCK_SIZE = 8 << 20
+
+
+def to_date(arr):
+    return pc.cast(pc.strptime(arr, format='%Y-%m-%d', unit='s', error_is_null=True), pa.date32())
+
+
+def to_store_batch(batch):
+    """RecordBatch string dari CSV -> RecordBatch dengan SCHEMA"""
+    cols = {name: batch.column(name) for name in batch.schema.names}
+    # CSV lama (sebelum ada kolom is_nil) -> False
+    is_nil = parse_nil(cols['is_nil']) if 'is_nil' in cols else pa.array([False] * batch.num_rows)
+    arrays = []
+    for field in SCHEMA:
+        if field.name not in cols and field.name not in ('numeric_value', 'is_nil'):
+            arrays.append(pa.nulls(batch.num_rows, field.type))
+        elif field.name == 'numeric_value':
+            arrays.append(parse_numeric(cols['value'], is_nil))
+        elif field.name == 'is_nil':
+            arrays.append(is_nil)
+        elif field.type == pa.date32():
+            arrays.append(to_date(cols[field.name]))
+        elif field.type == DICT:
+            arrays.append(pc.dictionary_encode(cols[field.name]).cast(DICT))
+        else:
+            arrays.append(cols[field.name])
+    return pa.RecordBatch.from_arrays(arrays, schema=SCHEMA)
+
+
+def _max_year(batch):
+    years = pc.year(pc.coalesce(to_date(batch.column('period_end')), to_date(batch.column('instant'))))
+    return pc.max(years).as_py()
+
+
+def write_fact_partition(facts_csv, store_root, base, year=None):
+    """
+    Tulis satu {base}_facts.csv ke partisi year/emiten_code. `year` dari nama
+    file kalau ada, selain itu tahun period_end/instant terakhir di fakta.
+    Return path parquet, atau None kalau tidak ada fakta.
+    """
+    store_root = Path(store_root)
+    store_root.mkdir(parents=True, exist_ok=True)
+    tmp = store_root / f".{base}.parquet.part"
+
+    reader = pacsv.open_csv(
+        facts_csv,
+        read_options=pacsv.ReadOptions(block_size=BLOCK_SIZE),
+        convert_options=pacsv.ConvertOptions(
+            column_types={c: (pa.bool_() if c == 'is_nil' else pa.string()) for c in CSV_COLUMNS},
+            strings_can_be_null=True,
+        ),
+    )
+
+    code = None
+    data_year = None
+    n = 0
+    with pq.ParquetWriter(tmp, SCHEMA, compression='zstd') as writer:
+        for batch in reader:
+            if not batch.num_rows:
+                continue
+            if code is None:
+                code = batch.column('emiten_code')[0].as_py()
+            if year is None:
+                y = _max_year(batch)
+                if y is not None and (data_year is None or y > data_year):
+                    data_year = y
+            writer.write_batch(to_store_batch(batch))
+            n += batch.num_rows
+
+    if n == 0:
+        tmp.unlink()
+        return None
+
+    year = year if year is not None else data_year
+    dest_dir = store_root / f"year={year}" / f"emiten_code={code or base.split('_')[0]}"
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    dest = dest_dir / f"part-{base}.parquet"
+    os.replace(tmp, dest)
+    return dest
+
+
+def open_fact_store(store_root):
+    """
+    pyarrow Dataset atas fact store. Contoh:
+        open_fact_store(root).to_table(columns=['concept_qname', 'numeric_value'],
+                                       filter=ds.field('year') == 2024)
+    hanya membaca kolom dan partisi yang diminta.
+    """
+    return ds.dataset(store_root, format='parquet', partitioning=PARTITIONING)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tulis/baca dokumen JSON hasil konversi XBRL dalam beberapa format:
+
+    pretty   {base}.json          indent=2 (default, sama seperti sebelumnya)
+    compact  {base}.json          tanpa spasi/indent
+    orjson   {base}.json          compact, diserialisasi orjson (lebih cepat)
+    msgpack  {base}.msgpack.zst   MessagePack + kompresi zstd
+
+Semua format berisi dokumen yang sama (load_document(...) == dokumen asli).
+DocumentWriter menulis dokumen {root: {key: value}} per member (mis. per
+elemen top-level saat parse streaming) tanpa menyimpan seluruh dokumen di
+memori; hasilnya sama dengan dump_document.
+Konsumen cukup pakai document_files() + load_document(), format dikenali
+dari nama file. orjson / msgpack / zstandard opsional, hanya perlu kalau
+format itu dipakai (orjson juga dipakai untuk membaca .json kalau terpasang).
+"""
+
+import json
+import tempfile
+from array import array
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # fallback ke json bawaan
+    orjson = None
+
+FORMATS = ['pretty', 'compact', 'orjson', 'msgpack']
+MSGPACK_SUFFIX = '.msgpack.zst'
+DOCUMENT_SUFFIXES = ('.json', MSGPACK_SUFFIX)
+ZSTD_LEVEL = 10
+PRETTY_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+
+def _msgpack_zstd():
+    try:
+        import msgpack
+        import zstandard
+    except ImportError as e:
+        raise ImportError("format msgpack butuh paket 'msgpack' dan 'zstandard'") from e
+    return msgpack, zstandard
+
+
+def document_path(out_base, fmt='pretty'):
+    """{out_base}.json atau {out_base}.msgpack.zst sesuai format"""
+    out_base = str(out_base)
+    return Path(out_base + (MSGPACK_SUFFIX if fmt == 'msgpack' else '.json'))
+
+
+def dump_document(document, out_base, fmt='pretty'):
+    """Tulis dokumen ke {out_base}.<ext> sesuai `fmt`, return path"""
+    path = document_path(out_base, fmt)
+    if fmt == 'pretty':
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+    elif fmt == 'compact':
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False, separators=(',', ':'))
+    elif fmt == 'orjson':
+        if orjson is None:
+            raise ImportError("format orjson butuh paket 'orjson'")
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(document))
+    elif fmt == 'msgpack':
+        msgpack, zstandard = _msgpack_zstd()
+        data = msgpack.packb(document, use_bin_type=True)
+        with open(path, 'wb') as f:
+            f.write(zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data))
+    else:
+        raise ValueError(f"Format tidak dikenal: {fmt} (pilihan: {', '.join(FORMATS)})")
+    return path
+
+
+class DocumentWriter:
+    """
+    Tulis {root: {key: value, ...}} secara bertahap. add(key, value) langsung
+    men-serialisasi value ke file spool sementara (hanya offset yang disimpan);
+    key berulang jadi list di posisi kemunculan pertama, seperti xmltodict.
+    close() merangkai file akhir dari spool. Memori ~ jumlah member, bukan
+    ukuran dokumen.
+    """
+
+    def __init__(self, out_base, fmt='pretty'):
+        if fmt not in FORMATS:
+            raise ValueError(f"Format tidak dikenal: {fmt} (pilihan: {', '.join(FORMATS)})")
+        if fmt == 'orjson' and orjson is None:
+            raise ImportError("format orjson butuh paket 'orjson'")
+        self.path = document_path(out_base, fmt)
+        self.fmt = fmt
+        self.root = 'root'
+        self._members = {}  # key -> array [offset, length, offset, length, ...]
+        self._spool = tempfile.TemporaryFile(dir=self.path.parent)
+        self._pos = None  # posisi baca spool saat close()
+        if fmt == 'msgpack':
+            self._msgpack, self._zstd = _msgpack_zstd()
+
+    def _encode(self, value):
+        if self.fmt == 'pretty':
+            # OPT_INDENT_2 menghasilkan byte yang sama dengan json.dumps(indent=2, ensure_ascii=False)
+            if orjson is not None:
+                return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+            return PRETTY_ENCODER.encode(value).encode('utf-8')
+        if self.fmt == 'compact':
+            return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if self.fmt == 'orjson':
+            return orjson.dumps(value)
+        return self._msgpack.packb(value, use_bin_type=True)
+
+    def add(self, key, value):
+        data = self._encode(value)
+        spans = self._members.get(key)
+        if spans is None:
+            spans = self._members[key] = array('q')
+        spans.append(self._spool.tell())
+        spans.append(len(data))
+        self._spool.write(data)
+
+    def _fragments(self, spans, indent=b''):
+        for i in range(0, len(spans), 2):
+            if self._pos != spans[i]:  # member tunggal berurutan di spool -> tanpa seek
+                self._spool.seek(spans[i])
+            data = self._spool.read(spans[i + 1])
+            self._pos = spans[i] + spans[i + 1]
+            yield data.replace(b'\n', b'\n' + indent) if indent else data
+
+    def _write_json(self, out):
+        pretty = self.fmt == 'pretty'
+        dumps = (lambda v: orjson.dumps(v)) if self.fmt == 'orjson' else \
+            (lambda v: json.dumps(v, ensure_ascii=False).encode('utf-8'))
+        nl = (lambda depth: b'\n' + b'  ' * depth) if pretty else (lambda depth: b'')
+        colon = b': ' if pretty else b':'
+
+        out.write(b'{' + nl(1) + dumps(self.root) + colon)
+        if not self._members:
+            out.write(b'null' + nl(0) + b'}')
+            return
+        out.write(b'{')
+        for i, (key, spans) in enumerate(self._members.items()):
+            out.write((b',' if i else b'') + nl(2) + dumps(key) + colon)
+            if len(spans) == 2:
+                out.write(next(self._fragments(spans, b'    ' if pretty else b'')))
+                continue
+            out.write(b'[')
+            for j, data in enumerate(self._fragments(spans, b'      ' if pretty else b'')):
+                out.write((b',' if j else b'') + nl(3) + data)
+            out.write(nl(2) + b']')
+        out.write(nl(1) + b'}' + nl(0) + b'}')
+
+    def _write_msgpack(self, out):
+        packer = self._msgpack.Packer(use_bin_type=True)
+        with self._zstd.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(out, closefd=False) as z:
+            z.write(packer.pack_map_header(1) + packer.pack(self.root))
+            if not self._members:
+                z.write(packer.pack(None))
+                return
+            z.write(packer.pack_map_header(len(self._members)))
+            for key, spans in self._members.items():
+                z.write(packer.pack(key))
+                if len(spans) > 2:
+                    z.write(packer.pack_array_header(len(spans) // 2))
+                for data in self._fragments(spans):
+                    z.write(data)
+
+    def close(self):
+        """Rangkai file akhir, return path"""
+        try:
+            self._spool.seek(0)
+            self._pos = 0
+            with open(self.path, 'wb') as out:
+                if self.fmt == 'msgpack':
+                    self._write_msgpack(out)
+                else:
+                    self._write_json(out)
+        finally:
+            self.discard()
+        return self.path
+
+    def discard(self):
+        """Buang spool tanpa menulis file akhir"""
+        self._spool.close()
+        self._members = {}
+
+
+def load_document(path):
+    """Baca dokumen .json (format apa pun) atau .msgpack.zst"""
+    path = Path(path)
+    if path.name.endswith(MSGPACK_SUFFIX):
+        msgpack, zstandard = _msgpack_zstd()
+        with open(path, 'rb') as f:
+            data = zstandard.ZstdDecompressor().stream_reader(f).read()
+        return msgpack.unpackb(data, raw=False)
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def is_document_file(name):
+    return str(name).endswith(DOCUMENT_SUFFIXES)
+
+
+def document_stem(name):
+    """'AALI_2024_instance.msgpack.zst' / '..._instance.json' -> 'AALI_2024_instance'"""
+    name = Path(name).name
+    for suffix in DOCUMENT_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def document_files(folder, stem_suffix=''):
+    """Semua dokumen di folder (tidak rekursif) yang stem-nya berakhiran `stem_suffix`"""
+    return sorted(
+        p for p in Path(folder).iterdir()
+        if p.is_file() and is_document_file(p.name) and document_stem(p.name).endswith(stem_suffix)
+    )
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index key (SQLite) atas folder dokumen JSON hasil konversi: <folder>/key_index.sqlite
+
+Dokumen hasil konversi selalu {root: {member: value, ...}} (root = 'xbrl').
+Setiap member root (context, unit, idx-cor:PartyName, @xmlns:..., dst.) jadi
+satu fragmen: key, path 'xbrl/<key>', offset byte value-nya di file, plus
+teks fragmen (semua key + string di dalamnya) di tabel FTS5 trigram, jadi
+pencarian substring (case-insensitive) tidak perlu membuka dokumen.
+
+    idx = KeyIndex.for_folder(json_dir)
+    idx.update()                                   # index file baru/berubah
+    rows = idx.find(concept='idx-cor:CounterpartyName')
+    rows = idx.find(text='pihak berelasi')         # semua kata harus ada
+    for row, value in load_fragments(json_dir, rows):
+        ...
+
+Hasil find() adalah kandidat: fragmen yang mengandung kata-kata itu, regex
+yang lebih ketat tetap dicek pada fragmen yang dimuat. Hanya bagian file
+yang ditunjuk yang dibaca; dokumen .msgpack.zst (terkompresi, tanpa offset)
+dimuat utuh sekali per file.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from itertools import groupby
+from json.decoder import scanstring
+from multiprocessing import Pool
+from pathlib import Path
+
+from xbrl_pipeline.json_io import MSGPACK_SUFFIX, document_files, load_document
+from xbrl_pipeline.qname import local_name_of
+
+try:
+    import orjson
+except ImportError:  # fallback ke json bawaan
+    orjson = None
+
+INDEX_NAME = 'key_index.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id       INTEGER PRIMARY KEY,
+    file     TEXT UNIQUE NOT NULL,
+    size     INTEGER,
+    mtime_ns INTEGER,
+    root     TEXT
+);
+CREATE TABLE IF NOT EXISTS fragments (
+    id         INTEGER PRIMARY KEY,
+    doc_id     INTEGER NOT NULL,
+    ord        INTEGER NOT NULL,
+    key        TEXT NOT NULL,
+    local_name TEXT,
+    start      INTEGER,
+    end        INTEGER
+);
+CREATE INDEX IF NOT EXISTS fragments_key ON fragments (key);
+CREATE INDEX IF NOT EXISTS fragments_local ON fragments (local_name);
+CREATE INDEX IF NOT EXISTS fragments_doc ON fragments (doc_id, ord);
+CREATE VIRTUAL TABLE IF NOT EXISTS fragment_text USING fts5(text, tokenize='trigram');
+"""
+
+WS = re.compile(r'[ \t\n\r]*')
+DECODER = json.JSONDecoder()
+
+
+def _ws(s, i):
+    return WS.match(s, i).end()
+
+
+def _expect(s, i, ch):
+    if s[i:i + 1] != ch:
+        raise ValueError(f"format dokumen tidak dikenal (posisi {i}, harap '{ch}')")
+    return i + 1
+
+
+def iter_root_members(s):
+    """
+    Teks JSON {root: {key: value, ...}} -> root, lalu (key, value, start, end)
+    per member (offset karakter). Value di-decode satu per satu dengan
+    raw_decode, jadi posisi akhirnya diketahui tanpa parse ulang. Root yang
+    value-nya bukan objek -> tanpa member.
+    """
+    i = _expect(s, _ws(s, 0), '{')
+    root, i = scanstring(s, _expect(s, _ws(s, i), '"'))
+    i = _ws(s, _expect(s, _ws(s, i), ':'))
+    yield root
+    if s[i:i + 1] != '{':
+        return
+    i = _ws(s, i + 1)
+    if s[i:i + 1] == '}':
+        return
+    while True:
+        key, i = scanstring(s, _expect(s, i, '"'))
+        start = _ws(s, _expect(s, _ws(s, i), ':'))
+        value, end = DECODER.raw_decode(s, start)
+        yield key, value, start, end
+        i = _ws(s, end)
+        if s[i:i + 1] == '}':
+            return
+        i = _ws(s, _expect(s, i, ','))
+
+
+def fragment_text(key, value):
+    """Key + semua key/string di dalam value (unik, urutan pertama muncul)"""
+    seen = {key: None}
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, dict):
+            for k, v in obj.items():
+                seen.setdefault(k)
+                stack.append(v)
+        elif isinstance(obj, list):
+            stack.extend(obj)
+        elif isinstance(obj, str):
+            seen.setdefault(obj)
+    return '\n'.join(seen)
+
+
+def index_document(path):
+    """
+    Worker: (nama file, size, mtime_ns, root, [(key, start, end, text)], error).
+    Offset dalam byte; None untuk .msgpack.zst.
+    """
+    path = Path(path)
+    try:
+        st = os.stat(path)
+        if path.name.endswith(MSGPACK_SUFFIX):
+            doc = load_document(path)
+            if not isinstance(doc, dict) or not doc:
+                raise ValueError("format dokumen tidak dikenal (harap {root: {...}})")
+            root, members = next(iter(doc.items()))
+            members = members if isinstance(members, dict) else {}
+            frags = [(k, None, None, fragment_text(k, v)) for k, v in members.items()]
+            return path.name, st.st_size, st.st_mtime_ns, root, frags, None
+
+        raw = path.read_bytes()
+        s = raw.decode('utf-8')
+        ascii_only = len(s) == len(raw)
+        members = iter_root_members(s)
+        root = next(members)
+        frags = []
+        last_char = last_byte = 0
+        for key, value, start, end in members:
+            if ascii_only:
+                bstart, bend = start, end
+            else:  # offset karakter -> byte (maju terus, total O(n))
+                bstart = last_byte + len(s[last_char:start].encode('utf-8'))
+                bend = bstart + len(s[start:end].encode('utf-8'))
+                last_char, last_byte = end, bend
+            frags.append((key, bstart, bend, fragment_text(key, value)))
+        return path.name, st.st_size, st.st_mtime_ns, root, frags, None
+    except Exception as e:
+        return path.name, None, None, None, [], str(e)
+
+
+class KeyIndex:
+    """Index key/fragmen untuk satu folder dokumen (tidak rekursif)"""
+
+    def __init__(self, path, folder=None):
+        self.path = Path(path)
+        self.folder = Path(folder) if folder is not None else self.path.parent
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def for_folder(cls, folder):
+        return cls(Path(folder) / INDEX_NAME, folder)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _remove(self, doc_id):
+        self._conn.execute(
+            "DELETE FROM fragment_text WHERE rowid IN (SELECT id FROM fragments WHERE doc_id=?)", (doc_id,)
+        )
+        self._conn.execute("DELETE FROM fragments WHERE doc_id=?", (doc_id,))
+        self._conn.execute("DELETE FROM docs WHERE id=?", (doc_id,))
+
+    def stale_files(self, files):
+        """File yang belum di-index atau ukuran/mtime-nya berubah"""
+        with self._lock:
+            known = {r['file']: (r['size'], r['mtime_ns'])
+                     for r in self._conn.execute("SELECT file, size, mtime_ns FROM docs")}
+        stale = []
+        for f in files:
+            st = os.stat(f)
+            if known.get(f.name) != (st.st_size, st.st_mtime_ns):
+                stale.append(f)
+        return stale
+
+    def update(self, workers=1, on_file=None):
+        """
+        Sinkronkan index dengan isi folder: file baru/berubah di-index ulang,
+        file yang hilang dihapus. on_file(name, n_fragments, error) per file
+        yang di-index. Return jumlah file yang di-index ulang.
+        """
+        files = document_files(self.folder)
+        names = {f.name for f in files}
+        with self._lock:
+            with self._conn:
+                for r in self._conn.execute("SELECT id, file FROM docs").fetchall():
+                    if r['file'] not in names:
+                        self._remove(r['id'])
+
+        stale = self.stale_files(files)
+        if not stale:
+            return 0
+        if workers > 1 and len(stale) > 1:
+            with Pool(processes=workers, maxtasksperchild=50) as pool:
+                for result in pool.imap_unordered(index_document, stale, chunksize=1):
+                    self._store(*result, on_file=on_file)
+        else:
+            for f in stale:
+                self._store(*index_document(f), on_file=on_file)
+        return len(stale)
+
+    def _store(self, name, size, mtime_ns, root, frags, err, on_file=None):
+        with self._lock:
+            with self._conn:
+                old = self._conn.execute("SELECT id FROM docs WHERE file=?", (name,)).fetchone()
+                if old is not None:
+                    self._remove(old['id'])
+                if err is None:
+                    doc_id = self._conn.execute(
+                        "INSERT INTO docs (file, size, mtime_ns, root) VALUES (?, ?, ?, ?)",
+                        (name, size, mtime_ns, root)
+                    ).lastrowid
+                    for ord_, (key, start, end, text) in enumerate(frags):
+                        frag_id = self._conn.execute(
+                            "INSERT INTO fragments (doc_id, ord, key, local_name, start, end) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            (doc_id, ord_, key, local_name_of(key), start, end)
+                        ).lastrowid
+                        self._conn.execute(
+                            "INSERT INTO fragment_text (rowid, text) VALUES (?, ?)", (frag_id, text)
+                        )
+        if on_file is not None:
+            on_file(name, len(frags), err)
+
+    def find(self, concept=None, text=None, any_word=False, files=None):
+        """
+        Cari fragmen. `concept`: key persis ('idx-cor:PartyName'), local name
+        ('PartyName'), atau list keduanya. `text`: kata/substring (string
+        dipisah spasi, atau list), case-insensitive, minimal 3 huruf; semua
+        harus ada, atau salah satu kalau any_word=True. `files`: batasi ke
+        nama file tertentu. Return list sqlite3.Row (file, root, path, key,
+        ord, start, end) urut file lalu urutan di dokumen.
+        """
+        where, params = [], []
+        if concept is not None:
+            concepts = [concept] if isinstance(concept, str) else list(concept)
+            keys = [c for c in concepts if ':' in c or c.startswith('@')]
+            local = [c for c in concepts if c not in keys]
+            cond = []
+            if keys:
+                cond.append(f"f.key IN ({', '.join('?' * len(keys))})")
+                params.extend(keys)
+            if local:
+                cond.append(f"f.local_name IN ({', '.join('?' * len(local))})")
+                params.extend(local)
+            where.append('(' + ' OR '.join(cond) + ')')
+        if text is not None:
+            words = text.split() if isinstance(text, str) else list(text)
+            if any(len(w) < 3 for w in words):
+                raise ValueError("kata pencarian minimal 3 huruf (index trigram)")
+            query = (' OR ' if any_word else ' AND ').join('"' + w.replace('"', '""') + '"' for w in words)
+            where.append("f.id IN (SELECT rowid FROM fragment_text WHERE fragment_text MATCH ?)")
+            params.append(query)
+        if files is not None:
+            files = list(files)
+            where.append(f"d.file IN ({', '.join('?' * len(files))})")
+            params.extend(files)
+
+        sql = ("SELECT d.file, d.root, d.root || '/' || f.key AS path, f.key, f.ord, f.start, f.end "
+               "FROM fragments f JOIN docs d ON d.id = f.doc_id")
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY d.file, f.ord"
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def load_fragments(folder, rows):
+    """(row, value) untuk setiap hasil KeyIndex.find, satu buka file per dokumen"""
+    for name, group in groupby(rows, key=lambda r: r['file']):
+        path = Path(folder) / name
+        group = list(group)
+        if group[0]['start'] is None:  # .msgpack.zst: muat utuh
+            members = next(iter(load_document(path).values()))
+            for row in group:
+                yield row, members[row['key']]
+            continue
+        with open(path, 'rb') as f:
+            for row in group:
+                f.seek(row['start'])
+                yield row, _loads(f.read(row['end'] - row['start']))
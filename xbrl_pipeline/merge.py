@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gabung banyak CSV (mis. *_facts.csv) jadi satu CSV dan/atau Parquet tanpa
+pandas, memori konstan.
+
+- Kolom disatukan: urutan header yang paling umum, kolom baru dari file lain
+  ditambahkan di belakang; kolom yang tidak ada di suatu file diisi kosong.
+- CSV: file yang header-nya sama persis dengan kolom gabungan disalin per
+  byte (tanpa parse); selain itu di-stream per batch lewat pyarrow dan
+  kolomnya diurutkan ulang.
+- Parquet: semua file di-stream per batch (kolom string).
+- File yang gagal di-parse di tengah jalan dilewati utuh: batch-nya ditulis
+  dulu ke file Arrow IPC sementara dan baru disalin ke output setelah
+  seluruh file terbaca.
+"""
+
+import csv
+import io
+import shutil
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+BLOCK_SIZE = 8 << 20
+WRITE_OPTIONS = pacsv.WriteOptions(include_header=False, quoting_style='needed')
+
+
+def read_header(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return next(csv.reader(f), [])
+
+
+def header_line(columns):
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator='\n').writerow(columns)
+    return buf.getvalue().encode('utf-8')
+
+
+def unify_columns(headers):
+    """
+    Urutan kolom gabungan: header yang paling sering muncul (supaya sebanyak
+    mungkin file bisa disalin per byte), lalu kolom tambahan dari file lain
+    """
+    headers = [tuple(h) for h in headers]
+    counts = Counter(headers)
+    columns, seen = [], set()
+    for header in sorted(counts, key=lambda h: -counts[h]):
+        for c in header:
+            if c not in seen:
+                seen.add(c)
+                columns.append(c)
+    return columns
+
+
+def iter_batches(path, header, schema):
+    """RecordBatch (kolom string) dari satu CSV, disesuaikan ke `schema`"""
+    reader = pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(block_size=BLOCK_SIZE),
+        convert_options=pacsv.ConvertOptions(
+            column_types={c: pa.string() for c in header},
+            strings_can_be_null=True,
+        ),
+    )
+    for batch in reader:
+        cols = dict(zip(batch.schema.names, batch.columns))
+        yield pa.RecordBatch.from_arrays(
+            [cols.get(f.name, pa.nulls(batch.num_rows, pa.string())) for f in schema],
+            schema=schema,
+        )
+
+
+def spool_batches(path, header, schema, tmp_dir=None):
+    """
+    Parse satu CSV penuh ke file Arrow IPC sementara (memori tetap per batch).
+    Error parse muncul di sini, sebelum ada yang ditulis ke output.
+    """
+    spool = tempfile.TemporaryFile(dir=tmp_dir)
+    try:
+        with pa.ipc.new_stream(spool, schema) as writer:
+            for batch in iter_batches(path, header, schema):
+                writer.write_batch(batch)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def _copy_body(path, fout):
+    """Salin isi CSV tanpa baris header, return byte terakhir yang ditulis"""
+    last = b''
+    with open(path, 'rb') as fin:
+        fin.readline()
+        start = fin.tell()
+        shutil.copyfileobj(fin, fout)
+        if fin.tell() > start:
+            fin.seek(-1, 2)
+            last = fin.read(1)
+    return last
+
+
+def merge_files(files, out_csv=None, out_parquet=None, on_file=None):
+    """
+    Gabung `files` ke out_csv dan/atau out_parquet. on_file(path, how)
+    dipanggil per file (how: 'copy', 'stream', atau 'error: ...').
+    Return daftar kolom gabungan.
+    """
+    files = [Path(f) for f in files]
+    headers = {}
+    for f in files:
+        try:
+            headers[f] = read_header(f)
+        except (OSError, UnicodeDecodeError) as e:
+            if on_file is not None:
+                on_file(f, f"error: {e}")
+    files = [f for f in files if headers.get(f)]
+    columns = unify_columns(headers[f] for f in files)
+    schema = pa.schema([(c, pa.string()) for c in columns])
+
+    tmp_dir = Path(out_csv or out_parquet).parent
+    fout = open(out_csv, 'wb') if out_csv else None
+    pq_writer = pq.ParquetWriter(out_parquet, schema, compression='zstd') if out_parquet else None
+    try:
+        if fout is not None:
+            fout.write(header_line(columns))
+        for f in files:
+            header = headers[f]
+            same = header == columns
+            start = fout.tell() if fout is not None else None
+            spool = None
+            try:
+                csv_stream = fout is not None and not same
+                if csv_stream or pq_writer is not None:
+                    spool = spool_batches(f, header, schema, tmp_dir)
+                if fout is not None and same:
+                    if _copy_body(f, fout) not in (b'', b'\n'):
+                        fout.write(b'\n')
+                if spool is not None:
+                    csv_writer = pacsv.CSVWriter(fout, schema, write_options=WRITE_OPTIONS) if csv_stream else None
+                    for batch in pa.ipc.open_stream(spool):
+                        if csv_writer is not None:
+                            csv_writer.write_batch(batch)
+                        if pq_writer is not None:
+                            pq_writer.write_batch(batch)
+                    if csv_writer is not None:
+                        csv_writer.close()
+                how = 'copy' if same and pq_writer is None else 'stream'
+            except (OSError, pa.ArrowException) as e:
+                if fout is not None:  # buang tulisan setengah jadi dari file ini
+                    fout.seek(start)
+                    fout.truncate()
+                how = f"error: {e}"
+            finally:
+                if spool is not None:
+                    spool.close()
+            if on_file is not None:
+                on_file(f, how)
+    finally:
+        if fout is not None:
+            fout.close()
+        if pq_writer is not None:
+            pq_writer.close()
+    return columns
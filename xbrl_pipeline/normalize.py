@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Normalisasi nilai numerik fakta XBRL (sekali, vectorized).
+
+Aturan:
+- xsi:nil="true" -> is_nil=True, numeric_value null
+- nilai lexical sudah dalam satuan penuh; `decimals` hanya presisi
+  (decimals=-6 artinya dibulatkan ke jutaan), BUKAN faktor pengali
+- tanda dari lexical: '-1200' atau format akuntansi '(1,200)' -> negatif
+- pemisah ribuan ',' dan spasi dibuang; selain itu non-numerik -> null
+"""
+
+import re
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+NUMERIC_RE = r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+PAREN_RE = r'^\((.*)\)$'
+
+_numeric = re.compile(NUMERIC_RE)
+_paren = re.compile(PAREN_RE)
+
+
+def parse_numeric(values, is_nil=None):
+    """Array string (pyarrow) -> float64, null untuk nil / non-numerik"""
+    s = pc.utf8_trim_whitespace(values)
+    negative = pc.fill_null(pc.match_substring_regex(s, PAREN_RE), False)
+    s = pc.replace_substring_regex(s, PAREN_RE, r'\1')
+    s = pc.replace_substring(pc.replace_substring(s, ',', ''), ' ', '')
+    ok = pc.fill_null(pc.match_substring_regex(s, NUMERIC_RE), False)
+    if is_nil is not None:
+        ok = pc.and_(ok, pc.invert(pc.fill_null(is_nil, False)))
+    num = pc.cast(pc.if_else(ok, s, pa.scalar(None, pa.string())), pa.float64())
+    return pc.if_else(negative, pc.negate(num), num)
+
+
+def parse_nil(values):
+    """kolom is_nil dari CSV ('True'/'False'/'true'/kosong) -> bool"""
+    if pa.types.is_boolean(values.type):
+        return pc.fill_null(values, False)
+    return pc.fill_null(pc.equal(pc.utf8_lower(pc.cast(values, pa.string())), 'true'), False)
+
+
+def normalize_facts(df, value_col='value', nil_col='is_nil'):
+    """
+    Tambahkan kolom numeric_value (float) dan is_nil (bool) ke DataFrame
+    fakta (mis. hasil pd.read_csv(..._facts.csv, dtype=str)). In-place, return df.
+    """
+    values = pa.array(df[value_col], type=pa.string(), from_pandas=True)
+    if nil_col in df.columns:
+        is_nil = parse_nil(pa.array(df[nil_col], from_pandas=True))
+    else:
+        is_nil = pa.array([False] * len(df), type=pa.bool_())
+    df['is_nil'] = is_nil.to_numpy(zero_copy_only=False)
+    df['numeric_value'] = parse_numeric(values, is_nil).to_numpy(zero_copy_only=False)
+    return df
+
+
+def parse_number(text, is_nil=False):
+    """Versi satu nilai dari parse_numeric (aturan yang sama)"""
+    if is_nil or text is None:
+        return None
+    s = str(text).strip()
+    m = _paren.match(s)
+    if m:
+        s = m.group(1)
+    s = s.replace(',', '').replace(' ', '')
+    if not _numeric.match(s):
+        return None
+    num = float(s)
+    return -num if m else num
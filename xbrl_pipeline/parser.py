@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parser instance XBRL: fakta (baris FACT_COLUMNS) + dokumen JSON format
+xmltodict, dalam satu pass iterparse (InstanceStream). JSON ditulis per
+elemen top-level lewat json_io.DocumentWriter, jadi memori tidak ikut
+membesar dengan ukuran file.
+"""
+
+import hashlib
+import sys
+
+from lxml import etree
+
+# ---------- helpers ----------
+def text_of(node):
+    return (node.text or '').strip() if node is not None else None
+
+# ---------- JSON (format xmltodict, per elemen lxml) ----------
+XML_NS = 'http://www.w3.org/XML/1998/namespace'
+
+def prefixed_name(el_or_key, prefix_of=None, prefix=None):
+    """{ns}local -> prefix:local seperti di dokumen asli"""
+    ns, _, local = el_or_key[1:].rpartition('}') if el_or_key[0] == '{' else ('', '', el_or_key)
+    if ns and prefix is None and prefix_of is not None:
+        prefix = 'xml' if ns == XML_NS else prefix_of.get(ns)
+    return f"{prefix}:{local}" if prefix else local
+
+def add_child(item, key, value):
+    """tag berulang -> list, seperti xmltodict"""
+    if key in item:
+        if isinstance(item[key], list):
+            item[key].append(value)
+        else:
+            item[key] = [item[key], value]
+    else:
+        item[key] = value
+
+def element_attrs(el, nsmap, parent_nsmap=None):
+    """'@xmlns[:p]' yang dideklarasikan di elemen ini + atribut '@prefix:name'"""
+    item = {}
+    if nsmap != parent_nsmap:  # umumnya sama persis dengan parent -> tanpa loop
+        for prefix, uri in nsmap.items():
+            if parent_nsmap is None or parent_nsmap.get(prefix) != uri:
+                item['@xmlns' if prefix is None else f'@xmlns:{prefix}'] = uri
+    prefix_of = None
+    for k, v in el.attrib.items():
+        if k[0] == '{' and prefix_of is None:  # hanya atribut ber-namespace butuh prefix
+            prefix_of = {u: p for p, u in nsmap.items() if p}
+        item['@' + prefixed_name(k, prefix_of)] = v
+    return item
+
+def element_to_dict(el, parent_nsmap=None):
+    """
+    Sama dengan xmltodict.parse(..., process_namespaces=False) untuk satu elemen:
+    atribut '@prefix:name', deklarasi '@xmlns[:p]', teks '#text', tag berulang -> list.
+    """
+    nsmap = el.nsmap
+    item = element_attrs(el, nsmap, parent_nsmap)
+
+    text = [el.text or '']
+    for child in el:
+        text.append(child.tail or '')
+        if not isinstance(child.tag, str):  # comment / processing instruction
+            continue
+        add_child(item, prefixed_name(child.tag, prefix=child.prefix), element_to_dict(child, nsmap))
+
+    data = ''.join(text).strip()
+    if not item:
+        return data or None
+    if data:
+        item['#text'] = data
+    return item
+
+
+# ---------- extractors ----------
+FACT_COLUMNS = ['concept_qname', 'local_name', 'value', 'unit', 'decimals',
+                'period_type', 'period_start', 'period_end', 'instant',
+                'context_ref', 'entity_identifier', 'dimensions', 'is_nil']
+CSV_COLUMNS = FACT_COLUMNS + ['file', 'emiten_code', 'emiten_name']
+
+INFRA_TAGS = {'schemaRef','context','unit','linkbaseRef','roleRef','arcroleRef'}
+FACT_ATTRS = ['contextRef','unitRef','decimals','precision','scale']
+XSI_NIL = '{http://www.w3.org/2001/XMLSchema-instance}nil'
+CODE_TAGS = frozenset(['TradingSymbol','EntityCommonStockTicker','SecuritySymbol','TickerSymbol','EntityCode','EntityShortName'])
+NAME_TAGS = frozenset(['EntityRegistrantName','EntityReportingAddressName','CompanyName','EntityLegalName','EntityCommonName','NameOfReportingEntity'])
+
+def xbrli_ns(el):
+    """'{namespace}' elemen xbrli (context/unit/root), '' kalau tanpa namespace"""
+    return el.tag[:el.tag.find('}') + 1]
+
+def parse_context(ctx):
+    """
+    Satu pass atas anak context (period, entity/identifier+segment, scenario),
+    dicocokkan dengan tag Clark namespace xbrli context itu sendiri.
+    """
+    ns = xbrli_ns(ctx)
+    period = {}
+    entity_identifier = None
+    dims = []
+    for child in ctx.iterchildren(tag=etree.Element):
+        tag = child.tag
+        if tag == ns + 'period':
+            for p in child.iterchildren(tag=etree.Element):
+                period.setdefault(p.tag, p)  # elemen pertama, seperti find()
+        elif tag == ns + 'entity':
+            for e in child.iterchildren(tag=etree.Element):
+                if e.tag == ns + 'identifier':
+                    if entity_identifier is None:
+                        entity_identifier = text_of(e)
+                elif e.tag == ns + 'segment':
+                    dims.extend(dimension_members(e))
+        elif tag == ns + 'scenario':
+            dims.extend(dimension_members(child))
+
+    # period (duration / instant)
+    period_type = start = end = instant = None
+    if ns + 'startDate' in period:
+        period_type = 'duration'
+        start = text_of(period[ns + 'startDate'])
+        end   = text_of(period.get(ns + 'endDate'))
+    elif ns + 'instant' in period:
+        period_type = 'instant'
+        instant = text_of(period[ns + 'instant'])
+
+    return {
+        'period_type': period_type,
+        'start': start, 'end': end, 'instant': instant,
+        'entity_identifier': entity_identifier,
+        'dimensions': '|'.join(sorted(dims)) or None,
+    }
+
+def dimension_members(container):
+    """
+    'dimension=member' untuk xbrldi:explicitMember/typedMember di segment/scenario;
+    parse_context menggabungkannya jadi 'dim1=member1|dim2=member2' (urut per dimensi)
+    """
+    for m in container.iterchildren(tag=etree.Element):
+        ln = m.tag.rpartition('}')[2]
+        if ln == 'explicitMember':
+            member = text_of(m)
+        elif ln == 'typedMember':
+            member = next((text_of(c) for c in m.iterchildren(tag=etree.Element)), None)
+        else:
+            continue
+        yield f"{m.get('dimension')}={member or ''}"
+
+def parse_unit(u):
+    # measure langsung, atau measure pertama di divide/unitNumerator
+    measure = next(u.iter(xbrli_ns(u) + 'measure'), None)
+    return text_of(measure) if measure is not None else None
+
+class RecordCache:
+    """
+    Memo parse_context/parse_unit untuk satu batch (per proses). Key = hash
+    serialisasi XML isi elemen (tanpa atribut id dan whitespace antar elemen),
+    jadi context/unit yang sama di filing lain (atau dengan id lain) tidak
+    di-parse ulang dan semua fakta berbagi satu record + string yang di-intern.
+    Record jangan diubah.
+    """
+
+    def __init__(self, max_size=200_000):
+        self.max_size = max_size
+        self.records = {}
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def key(el):
+        # C14N penuh kira-kira 2x lebih mahal dari parse_context sendiri;
+        # tostring per child sudah cukup stabil untuk filing dari generator yang sama
+        h = hashlib.blake2b(el.tag.encode(), digest_size=16)
+        for child in el.iterchildren():
+            h.update(etree.tostring(child, with_tail=False))
+        return h.digest()
+
+    def get(self, el, parse):
+        key = (parse, self.key(el))
+        rec = self.records.get(key)
+        if rec is not None:
+            self.hits += 1
+            return rec
+        self.misses += 1
+        rec = parse(el)
+        if isinstance(rec, dict):
+            rec = {k: sys.intern(v) if isinstance(v, str) else v for k, v in rec.items()}
+        elif isinstance(rec, str):
+            rec = sys.intern(rec)
+        if len(self.records) >= self.max_size:
+            self.records.clear()
+        self.records[key] = rec
+        return rec
+
+    def context(self, ctx):
+        return self.get(ctx, parse_context)
+
+    def unit(self, u):
+        return self.get(u, parse_unit)
+
+RECORD_CACHE = RecordCache()
+
+def fact_row(el, ln, ns, text, contexts, units):
+    """Satu baris fakta, atau None kalau elemen bukan fakta"""
+    has_attr = any(a in el.attrib for a in FACT_ATTRS)
+    if not (text or has_attr):
+        return None
+
+    ctx_id = el.get('contextRef')
+    unit_id = el.get('unitRef')
+
+    ctx = contexts.get(ctx_id, {}) if ctx_id else {}
+    unit = units.get(unit_id) if unit_id else None
+
+    return {
+        'concept_qname': f"{{{ns}}}{ln}" if ns else ln,
+        'local_name': ln,
+        'value': text,
+        'unit': unit,
+        'decimals': el.get('decimals') or el.get('precision'),
+        'period_type': ctx.get('period_type'),
+        'period_start': ctx.get('start'),
+        'period_end': ctx.get('end'),
+        'instant': ctx.get('instant'),
+        'context_ref': ctx_id,
+        'entity_identifier': ctx.get('entity_identifier'),
+        'dimensions': ctx.get('dimensions'),
+        'is_nil': el.get(XSI_NIL) == 'true',
+    }
+
+class InstanceStream:
+    """
+    Satu pass iterparse atas instance XBRL (memori tidak tergantung ukuran file).
+    Elemen top-level diproses begitu selesai di-parse lalu dibuang: context/unit
+    masuk ke lookup, fakta di-yield oleh facts(), dan kalau ada `writer`
+    (json_io.DocumentWriter) elemennya langsung ditulis sebagai member JSON.
+    Fakta yang context/unit-nya baru muncul belakangan ditahan sampai akhir dokumen.
+    Setelah facts() habis: company_info (writer.close() oleh pemanggil).
+    """
+
+    def __init__(self, inp, writer=None, cache=RECORD_CACHE):
+        self.inp = inp
+        self.writer = writer
+        self.cache = cache
+        self.contexts = {}
+        self.units = {}
+        self._code = self._name = self._symbol = self._identifier = None
+        self._company_pending = True  # False kalau kode + nama emiten sudah ketemu
+
+    @property
+    def company_info(self):
+        return self._code or self._symbol, self._name or self._identifier
+
+    def _see_company_tag(self, ln, text):
+        # elemen pertama (urutan dokumen) yang cocok menang; kode ketemu -> symbol tidak dipakai lagi
+        if self._code is None:
+            if ln in CODE_TAGS:
+                self._code = text
+            elif self._symbol is None and 'Symbol' in ln:
+                self._symbol = text
+        if self._name is None and ln in NAME_TAGS:
+            self._name = text
+
+    def _fact_rows(self, top, deferred):
+        for el in top.iter():
+            tag = el.tag
+            if not isinstance(tag, str):
+                continue
+            ns, _, ln = tag[1:].rpartition('}') if tag[0] == '{' else ('', '', tag)
+            if ln in INFRA_TAGS:
+                continue
+            text = (el.text or '').strip()
+            if text and self._company_pending:
+                self._see_company_tag(ln, text)
+                self._company_pending = self._code is None or self._name is None
+
+            row = fact_row(el, ln, ns, text, self.contexts, self.units)
+            if row is None:
+                continue
+            ctx_id, unit_id = row['context_ref'], el.get('unitRef')
+            if (ctx_id and ctx_id not in self.contexts) or (unit_id and unit_id not in self.units):
+                deferred.append((row, unit_id))
+            else:
+                yield row
+
+    def _resolve(self, row, unit_id):
+        ctx = self.contexts.get(row['context_ref'], {}) if row['context_ref'] else {}
+        row.update({
+            'unit': self.units.get(unit_id) if unit_id else None,
+            'period_type': ctx.get('period_type'),
+            'period_start': ctx.get('start'),
+            'period_end': ctx.get('end'),
+            'instant': ctx.get('instant'),
+            'entity_identifier': ctx.get('entity_identifier'),
+            'dimensions': ctx.get('dimensions'),
+        })
+        return row
+
+    def facts(self):
+        deferred = []
+        writer = self.writer
+        root = root_nsmap = None
+        root_text = []
+
+        with self.inp.open() as fh:
+            events = etree.iterparse(fh, events=('end',), remove_comments=True,
+                                     recover=True, huge_tree=True)
+            for _, el in events:
+                if root is None:
+                    root = el.getroottree().getroot()
+                    root_nsmap = root.nsmap
+                    if writer is not None:
+                        writer.root = prefixed_name(root.tag, prefix=root.prefix)
+                        for k, v in element_attrs(root, root_nsmap).items():
+                            writer.add(k, v)
+                if el.getparent() is not root or not isinstance(el.tag, str):
+                    continue
+
+                ln = el.tag.rpartition('}')[2]
+                if ln == 'context':
+                    ctx_id = el.get('id')
+                    if ctx_id:
+                        self.contexts[ctx_id] = self.cache.context(el)
+                        if self._identifier is None:
+                            self._identifier = self.contexts[ctx_id]['entity_identifier']
+                elif ln == 'unit':
+                    uid = el.get('id')
+                    if uid:
+                        self.units[uid] = self.cache.unit(el)
+                elif ln not in INFRA_TAGS:
+                    yield from self._fact_rows(el, deferred)
+
+                if writer is not None:
+                    writer.add(prefixed_name(el.tag, prefix=el.prefix), element_to_dict(el, root_nsmap))
+
+                # buang elemen yang sudah diproses (tail disimpan untuk #text root)
+                el.clear(keep_tail=True)
+                while el.getprevious() is not None:
+                    root_text.append(root[0].tail or '')
+                    del root[0]
+
+        for row, unit_id in deferred:
+            yield self._resolve(row, unit_id)
+
+        if writer is not None and root is not None:
+            data = ''.join([root.text or ''] + root_text + [c.tail or '' for c in root]).strip()
+            if data:
+                writer.add('#text', data)
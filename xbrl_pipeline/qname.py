@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Helper nama konsep XBRL tanpa dependensi (dipakai fact_index dan key_index,
+jadi pembaca index tidak perlu pyarrow/lxml hanya untuk ini).
+"""
+
+
+def local_name_of(concept):
+    """'{ns}PartyName' / 'idx-cor:PartyName' / 'PartyName' -> 'PartyName'"""
+    return concept.rpartition('}')[2].rpartition(':')[2]
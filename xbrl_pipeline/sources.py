@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sumber input XBRL untuk pipeline konversi (lihat convert.py):
+
+    files  file .xbrl/.xml, atau folder (rekursif), mis. hasil flat copy
+           ({Company}_{Year}_instance.xbrl)
+    tree   pohon download Year/Company/instance/*.xbrl (data/, missing_data/)
+           langsung, tanpa flat copy
+    zip    Year/Company/instance.zip, member dibaca langsung dari zip
+    manifest  copy_log.json dari collector (mode manifest): file asli dibaca
+           langsung dengan nama dari view
+"""
+
+import json
+import os
+import zipfile
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+XBRL_SUFFIXES = ('.xbrl', '.xml')
+
+class XbrlInput(NamedTuple):
+    path: str                     # file .xbrl/.xml atau .zip
+    member: Optional[str] = None  # nama file di dalam zip
+    base: Optional[str] = None    # nama output (tanpa ekstensi)
+
+    @property
+    def name(self):
+        """nama file seperti hasil flat copy ({base} + ekstensi), untuk kolom 'file'"""
+        if self.base is None:
+            return os.path.basename(self.path)
+        return f"{self.base}{Path(self.member or self.path).suffix}"
+
+    @property
+    def year(self):
+        """tahun dari nama {Company}_{Year}_..., None kalau tidak ada"""
+        parts = (self.base or '').split('_')
+        return int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+
+    @property
+    def label(self):
+        return f"{self.path}!{self.member}" if self.member else self.path
+
+    def open(self):
+        """file object biner; member zip di-stream tanpa ditulis ke disk"""
+        if self.member is None:
+            return open(self.path, 'rb')
+        zf = zipfile.ZipFile(self.path)
+        try:
+            fh = zf.open(self.member)
+        except Exception:
+            zf.close()
+            raise
+        zf.close()  # ZipExtFile tetap bisa dibaca, file ditutup saat fh ditutup
+        return fh
+
+def zip_inputs(zip_path):
+    """Member .xbrl/.xml dalam .../{Year}/{Company}/instance.zip -> base {Company}_{Year}_{stem}"""
+    zp = Path(zip_path)
+    company, year = zp.parent.name, zp.parent.parent.name
+    with zipfile.ZipFile(zp) as zf:
+        members = [m for m in zf.namelist() if m.lower().endswith(XBRL_SUFFIXES)]
+    return [XbrlInput(str(zp), m, f"{company}_{year}_{Path(m).stem}") for m in members]
+
+def file_inputs(in_path):
+    in_path = Path(in_path)
+    # tangkap file di level ini + semua subfolder
+    if in_path.is_dir():
+        files = [str(p) for p in in_path.rglob('*.xbrl')] + \
+                [str(p) for p in in_path.rglob('*.xml')]
+    else:
+        files = [str(in_path)]
+    return [XbrlInput(fp, None, Path(fp).stem) for fp in files]
+
+def tree_inputs(base_path):
+    """Year/Company/instance/*.xbrl|*.xml -> base {Company}_{Year}_{stem} (sama dengan nama flat copy)"""
+    inputs = []
+    for year_dir in sorted(Path(base_path).iterdir()):
+        if not year_dir.is_dir():
+            continue
+        for company_dir in sorted(year_dir.iterdir()):
+            instance_dir = company_dir / 'instance'
+            if not instance_dir.is_dir():
+                continue
+            for fp in sorted(instance_dir.iterdir()):
+                if fp.is_file() and fp.suffix.lower() in XBRL_SUFFIXES:
+                    inputs.append(XbrlInput(str(fp), None, f"{company_dir.name}_{year_dir.name}_{fp.stem}"))
+    return inputs
+
+def zip_tree_inputs(in_path, errors=None):
+    """
+    Semua instance.zip di bawah in_path. Arsip rusak/tidak terbaca tidak
+    menghentikan yang lain: dicatat ke `errors` sebagai (path, pesan), atau
+    dicetak [ERROR] kalau errors None.
+    """
+    in_path = Path(in_path)
+    zips = sorted(in_path.rglob('*.zip')) if in_path.is_dir() else [in_path]
+    inputs = []
+    for z in zips:
+        try:
+            inputs.extend(zip_inputs(z))
+        except (zipfile.BadZipFile, OSError) as e:
+            if errors is None:
+                print(f"[ERROR] {z}: {e}")
+            else:
+                errors.append((str(z), str(e)))
+    return inputs
+
+def manifest_base(entry):
+    """
+    Base output untuk satu entri copy_log.json, sama dengan nama flat copy:
+    view flat ({Company}_{Year}_{stem}.xbrl) -> stem, view organized
+    ({Company}/{Year}/{stem}.xbrl) -> {Company}_{Year}_{stem}
+    """
+    new = Path(entry['new'])
+    company, year = entry.get('company'), entry.get('year')
+    if company and year and new.parent.name == str(year) and new.parent.parent.name == company:
+        return f"{company}_{year}_{new.stem}"
+    return new.stem
+
+def manifest_inputs(in_path):
+    """
+    View virtual hasil collector mode manifest: copy_log.json (atau folder
+    yang berisi copy_log.json) -> file asli, base dari nama di view (flat
+    maupun organized). Dua entri dengan base sama -> ValueError (output
+    akan saling timpa).
+    """
+    in_path = Path(in_path)
+    log_path = in_path / 'copy_log.json' if in_path.is_dir() else in_path
+    with open(log_path, encoding='utf-8') as f:
+        copied = json.load(f)['copied_files']
+    inputs, seen = [], {}
+    for c in copied:
+        base = manifest_base(c)
+        if base in seen:
+            raise ValueError(f"{log_path}: {seen[base]} dan {c['new']} sama-sama jadi {base}")
+        seen[base] = c['new']
+        inputs.append(XbrlInput(c['original'], None, base))
+    return inputs
+
+SOURCES = {
+    'files': file_inputs,
+    'tree': tree_inputs,
+    'zip': zip_tree_inputs,
+    'manifest': manifest_inputs,
+}
+
+def collect_inputs(in_path, source='files', errors=None):
+    """
+    Daftar XbrlInput dari `in_path` menurut jenis sumber (lihat SOURCES).
+    Sumber zip: arsip yang gagal dibuka masuk ke `errors` (lihat zip_tree_inputs).
+    """
+    if source not in SOURCES:
+        raise ValueError(f"Sumber tidak dikenal: {source} (pilihan: {', '.join(SOURCES)})")
+    if source == 'zip':
+        return zip_tree_inputs(in_path, errors)
+    return SOURCES[source](in_path)
@@ -1,15 +1,26 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 # Scan banyak JSON hasil konversi XBRL -> ambil Related Party facts
+# File di-scan paralel (process pool), hit langsung ditulis ke CSV/JSON.
+# use_index: jawab dari key_index.sqlite (xbrl_pipeline/key_index.py), hanya
+# fragmen yang mengandung kata kunci yang dimuat dari disk.
 
-import json, re
+import csv, json, os, re, sys
+from functools import lru_cache
+from itertools import groupby
+from multiprocessing import Pool
 from pathlib import Path
-import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root -> xbrl_pipeline
+from xbrl_pipeline.json_io import MSGPACK_SUFFIX, document_files, load_document
+from xbrl_pipeline.key_index import KeyIndex, load_fragments
 
 # Folder sumber JSON
 json_dir = Path(r"D:\Tugas_Akhir\xbrl_to_jason\xbrl_out")
 out_csv  = Path(r"D:\Tugas_Akhir\xbrl_to_jason\related_party_from_json.csv")
 out_json = Path(r"D:\Tugas_Akhir\xbrl_to_jason\related_party_from_json.json")
+workers  = os.cpu_count() or 1  # proses paralel
+use_index = True  # False: parse semua file seperti dulu
 
 # pola pencarian
 PATTERNS = [
@@ -21,46 +32,116 @@ PATTERNS = [
     r'amounts?\s*owed\s*to\s*related', r'balances?\s*with\s*related',
     r'disclosure[s]?\s*of\s*related'
 ]
-REGEXES = [re.compile(p, re.I) for p in PATTERNS]
+COMBINED = re.compile('|'.join(f'(?:{p})' for p in PATTERNS), re.I)
+
+# setiap pola pasti mengandung salah satu kata ini (huruf kecil): cek substring
+# murah sebelum regex, dan file yang tidak mengandungnya sama sekali tidak di-parse
+ANCHORS = ('relat', 'berelasi', 'terkait')
+ANCHORS_B = tuple(a.encode() for a in ANCHORS)
+
+CSV_FIELDS = ["file", "path", "key", "value"]
+
+
+def matches(text):
+    low = text.lower()
+    return any(a in low for a in ANCHORS) and COMBINED.search(text) is not None
+
+key_matches = lru_cache(maxsize=65536)(matches)  # nama key (tag XBRL) berulang di semua file
 
-rows = []
 
 def search(obj, parent="", file=""):
-    """recursive cari pola di key atau value JSON"""
+    """recursive cari pola di key atau value JSON (generator baris hit)"""
     if isinstance(obj, dict):
-        for k,v in obj.items():
+        for k, v in obj.items():
             path = f"{parent}/{k}" if parent else k
-            if any(rx.search(k) for rx in REGEXES):
-                rows.append({"file": file, "path": path, "key": k, "value": v})
-            search(v, path, file)
+            if key_matches(k):
+                yield {"file": file, "path": path, "key": k, "value": v}
+            yield from search(v, path, file)
     elif isinstance(obj, list):
         for i, item in enumerate(obj):
-            search(item, f"{parent}[{i}]", file)
-    else:
-        if isinstance(obj, str) and any(rx.search(obj) for rx in REGEXES):
-            rows.append({"file": file, "path": parent, "key": "", "value": obj})
+            yield from search(item, f"{parent}[{i}]", file)
+    elif isinstance(obj, str) and matches(obj):
+        yield {"file": file, "path": parent, "key": "", "value": obj}
+
+
+def may_contain_hits(path):
+    """False kalau isi file pasti tidak mengandung pola (tanpa parse JSON)"""
+    if path.name.endswith(MSGPACK_SUFFIX):
+        return True  # terkompresi, langsung di-parse
+    with open(path, "rb") as fp:
+        raw = fp.read().lower()
+    return any(a in raw for a in ANCHORS_B)
+
+
+def scan_file(path):
+    """Worker: (nama file, list hit, error)"""
+    try:
+        if not may_contain_hits(path):
+            return path.name, [], None
+        return path.name, list(search(load_document(path), file=path.name)), None
+    except Exception as e:
+        return path.name, [], str(e)
+
+
+def scan_all(files):
+    with Pool(processes=workers) as pool:
+        # imap: urutan hasil sama dengan urutan file
+        yield from pool.imap(scan_file, files, chunksize=4)
+
+
+def scan_index():
+    """Sama seperti scan_all, tapi kandidat diambil dari index (diperbarui dulu)"""
+    def report(name, n_fragments, err):
+        if err is not None:
+            print(f"[ERROR] {json_dir / name}: {err}")
+
+    idx = KeyIndex.for_folder(json_dir)
+    idx.update(workers=workers, on_file=report)
+    rows = idx.find(text=ANCHORS, any_word=True)  # superset: setiap pola mengandung anchor
+    idx.close()
+    for name, group in groupby(load_fragments(json_dir, rows), key=lambda rv: rv[0]['file']):
+        hits = []
+        for row, value in group:
+            hits.extend(search({row['key']: value}, row['root'], name))
+        yield name, hits, None
+
+
+def cell(value):
+    # sama seperti pandas.to_csv: None -> kosong, dict/list -> str()
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
 
 def main():
-    files = list(json_dir.glob("*.json"))
+    files = document_files(json_dir)  # .json atau .msgpack.zst
     print(f"Scanning {len(files)} JSON files...")
-    for i, f in enumerate(files, 1):
-        try:
-            with open(f, encoding="utf-8") as fp:
-                data = json.load(fp)
-            before = len(rows)
-            search(data, file=f.name)
-            new = len(rows) - before
-            if new:
-                print(f"[{i}/{len(files)}] {f.name} -> {new} hits")
-        except Exception as e:
-            print(f"[ERROR] {f}: {e}")
-
-    # simpan ke CSV dan JSON
-    df = pd.DataFrame(rows)
-    df.to_csv(out_csv, index=False, encoding="utf-8")
-    df.to_json(out_json, orient="records", indent=2, force_ascii=False)
-
-    print(f"\n[DONE] Found {len(rows)} related-party rows")
+
+    position = {f.name: i for i, f in enumerate(files, 1)}
+    results = scan_index() if use_index else scan_all(files)
+
+    total = 0
+    with open(out_csv, "w", encoding="utf-8", newline="") as fcsv, \
+         open(out_json, "w", encoding="utf-8") as fjson:
+        w = csv.writer(fcsv, lineterminator="\n")  # seperti pandas.to_csv
+        w.writerow(CSV_FIELDS)
+        fjson.write("[")
+
+        for name, hits, err in results:
+            if err is not None:
+                print(f"[ERROR] {json_dir / name}: {err}")
+                continue
+            for row in hits:
+                w.writerow([cell(row[k]) for k in CSV_FIELDS])
+                rec = json.dumps(row, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+                fjson.write(("," if total else "") + "\n  " + rec)
+                total += 1
+            if hits:
+                print(f"[{position.get(name)}/{len(files)}] {name} -> {len(hits)} hits")
+
+        fjson.write("\n]" if total else "]")
+
+    print(f"\n[DONE] Found {total} related-party rows")
     print(f"- CSV : {out_csv}")
     print(f"- JSON: {out_json}")
 
@@ -1,30 +1,41 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 # Merge semua *_facts.csv jadi ALL_facts.csv (tanpa makan RAM besar)
+# Header sama -> disalin per byte, beda urutan/kolom -> di-stream pyarrow
+# dan kolomnya disatukan (lihat xbrl_pipeline/merge.py)
 
-import pandas as pd
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root -> xbrl_pipeline
+from xbrl_pipeline.merge import merge_files
+
 # folder hasil sebelumnya
 out_dir = Path(r"D:/Tugas_Akhir/xbrl_to_jason/xbrl_out")
 
 # file output
 all_path = out_dir / "ALL_facts.csv"
+parquet_path = out_dir / "ALL_facts.parquet"
+write_parquet = False  # True: tulis juga ALL_facts.parquet
 
 # cari semua *_facts.csv (kecuali ALL_facts.csv lama kalau ada)
 files = sorted([p for p in out_dir.glob("*_facts.csv") if not p.name.startswith("ALL_")])
 
 print(f"Ditemukan {len(files)} file facts, sedang digabung...")
 
-header_written = False
-with open(all_path, "w", encoding="utf-8", newline="") as fout:
-    for i, f in enumerate(files, 1):
-        try:
-            df = pd.read_csv(f, dtype=str)  # baca sebagai string biar aman
-            df.to_csv(fout, index=False, header=not header_written)
-            header_written = True
-            print(f"[{i}/{len(files)}] merged {f.name}")
-        except Exception as e:
-            print(f"[SKIP] {f.name} error: {e}")
-
-print(f"[DONE] ALL_facts.csv berhasil dibuat di {all_path}")
+done = 0
+
+def report(f, how):
+    global done
+    done += 1
+    if how.startswith("error"):
+        print(f"[SKIP] {f.name} {how}")
+    else:
+        print(f"[{done}/{len(files)}] merged {f.name} ({how})")
+
+columns = merge_files(files, out_csv=all_path,
+                      out_parquet=parquet_path if write_parquet else None, on_file=report)
+
+print(f"[DONE] ALL_facts.csv berhasil dibuat di {all_path} ({len(columns)} kolom)")
+if write_parquet:
+    print(f"[DONE] ALL_facts.parquet -> {parquet_path}")
@@ -6,59 +6,43 @@ Menganalisis hasil ekstraksi related party dari JSON XBRL
 """
 
 import json
+import sys
+import numpy as np
 import pandas as pd
 from pathlib import Path
-import re
 from typing import Dict, List, Any, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root -> xbrl_pipeline
+from xbrl_pipeline.categories import CategoryClassifier, load_category_mapping
+from xbrl_pipeline.json_io import load_document
+from xbrl_pipeline.normalize import normalize_facts, parse_number
+
+CATEGORY_FILE = Path(__file__).with_name("related_party_categories.json")
+
+def per_unique(series: pd.Series, func) -> np.ndarray:
+    """func(Series nilai unik) lalu disebar lagi ke semua baris (kolom dengan banyak nilai berulang)"""
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return np.asarray(func(pd.Series(uniques)), dtype=object)[codes]
+
+def nullable(series: pd.Series) -> list:
+    """Series -> list Python, NaN/NA -> None"""
+    return series.astype(object).where(series.notna(), None).tolist()
+
 class RelatedPartyAnalyzer:
-    def __init__(self):
-        # Mapping kategori related party berdasarkan tag name
-        self.category_mapping = {
-            'receivables': [
-                'TradeReceivablesRelatedParties',
-                'OtherReceivablesRelatedParties', 
-                'ReceivablesFromRelatedParties',
-                'CurrentCustomerReceivablesRelatedParties',
-                'NonCurrentCustomerReceivablesRelatedParties',
-                'RetentionReceivablesRelatedParties',
-                'UnbilledReceivablesRelatedParties'
-            ],
-            'payables': [
-                'TradePayablesRelatedParties',
-                'OtherPayablesRelatedParties',
-                'PayablesToRelatedParties',
-                'AccruedLiabilitiesRelatedParties'
-            ],
-            'revenue': [
-                'RevenueFromRelatedParties',
-                'SalesRelatedParties',
-                'RevenueRelatedParties'
-            ],
-            'expenses': [
-                'PurchasesFromRelatedParties',
-                'ExpensesRelatedParties',
-                'CostsRelatedParties'
-            ],
-            'loans': [
-                'LoansToRelatedParties',
-                'LoansFromRelatedParties',
-                'AdvancesToRelatedParties',
-                'AdvancesFromRelatedParties'
-            ],
-            'guarantees': [
-                'GuaranteesGivenToRelatedParties',
-                'GuaranteesReceivedFromRelatedParties'
-            ]
-        }
+    def __init__(self, category_file: Optional[str] = None):
+        # Mapping kategori related party berdasarkan tag name, dari file JSON
+        # (urutan kategori = prioritas); tambah pola/kategori cukup edit file-nya
+        self.category_mapping = load_category_mapping(category_file or CATEGORY_FILE)
+        self.classifier = CategoryClassifier(self.category_mapping)
         
     def load_extracted_data(self, json_file_path: str) -> List[Dict]:
         """Load hasil ekstraksi related party"""
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_document(json_file_path)
     
     def parse_xbrl_value(self, value_data: Any) -> Dict[str, Any]:
         """Parse nilai XBRL dan extract informasi penting"""
+        if isinstance(value_data, dict):  # fakta tunggal: dict, bukan list
+            value_data = [value_data]
         if isinstance(value_data, list):
             parsed_values = []
             for item in value_data:
@@ -72,20 +56,9 @@ class RelatedPartyAnalyzer:
                         'id': item.get('@id', '')
                     }
                     
-                    # Convert nilai ke numeric jika memungkinkan
-                    if parsed_item['value'] and not parsed_item['is_nil']:
-                        try:
-                            numeric_value = float(parsed_item['value'])
-                            # Adjust berdasarkan decimals
-                            if parsed_item['decimals']:
-                                decimals = int(parsed_item['decimals'])
-                                if decimals < 0:
-                                    numeric_value = numeric_value * (10 ** abs(decimals))
-                            parsed_item['numeric_value'] = numeric_value
-                        except ValueError:
-                            parsed_item['numeric_value'] = None
-                    else:
-                        parsed_item['numeric_value'] = None
+                    # Nilai XBRL sudah dalam satuan penuh; decimals hanya presisi,
+                    # bukan faktor pengali (lihat xbrl_pipeline/normalize.py)
+                    parsed_item['numeric_value'] = parse_number(parsed_item['value'], parsed_item['is_nil'])
                     
                     parsed_values.append(parsed_item)
             return parsed_values
@@ -94,105 +67,121 @@ class RelatedPartyAnalyzer:
     
     def categorize_transaction(self, key: str) -> str:
         """Kategorikan jenis transaksi related party"""
-        key_clean = key.split(':')[-1] if ':' in key else key
+        return self.classifier.classify_one(key)
+    
+    def categorize_keys(self, keys: pd.Series) -> np.ndarray:
+        """categorize_transaction untuk satu kolom key sekaligus (dihitung per key unik)"""
+        return per_unique(keys.fillna(''), lambda unique: self.classifier.classify(unique.tolist()))
+    
+    def build_tables(self, extracted_data: List[Dict]):
+        """
+        Data ekstraksi -> (records, facts, parsed_items):
+        records satu baris per record (file, path, key, value, company, year, category),
+        facts satu baris per item fakta dalam value (rec = nomor baris di records),
+        parsed_items dict parsed_values per item (urutan sama dengan facts)
+        """
+        records = pd.DataFrame(extracted_data, columns=['file', 'path', 'key', 'value'])
+        records['company'] = per_unique(records['file'], lambda f: f.str.split('_').str[0])
+        records['year'] = per_unique(records['file'], lambda f: f.str.split('_').str[1].fillna('UNKNOWN'))
+        records['category'] = self.categorize_keys(records['key'])
         
-        for category, patterns in self.category_mapping.items():
-            if any(pattern in key_clean for pattern in patterns):
-                return category
-        return 'other'
+        rec, items = [], []
+        for i, value in enumerate(records['value'].tolist()):
+            if isinstance(value, dict):  # fakta tunggal
+                value = [value]
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict):
+                        rec.append(i)
+                        items.append({
+                            'context': item.get('@contextRef', ''),
+                            'unit': item.get('@unitRef', ''),
+                            'decimals': item.get('@decimals', ''),
+                            'value': item.get('#text', None),
+                            'is_nil': item.get('@xsi:nil') == 'true',
+                            'id': item.get('@id', '')
+                        })
+        facts = pd.DataFrame({
+            'rec': np.array(rec, dtype=np.int64),
+            'context': [item['context'] for item in items],
+            'value': [item['value'] for item in items],
+            'is_nil': np.array([item['is_nil'] for item in items], dtype=bool),
+        })
+        # Nilai XBRL sudah dalam satuan penuh; decimals hanya presisi (lihat xbrl_pipeline/normalize.py)
+        normalize_facts(facts, value_col='value', nil_col='is_nil')
+        for item, number in zip(items, nullable(facts['numeric_value'])):
+            item['numeric_value'] = number
+        return records, facts, items
     
     def analyze_extracted_data(self, extracted_data: List[Dict]) -> Dict[str, Any]:
-        """Analisis data related party yang telah diekstrak"""
-        analysis = {
-            'summary': {
-                'total_records': len(extracted_data),
-                'total_companies': len(set(item['file'].split('_')[0] for item in extracted_data)),
-                'total_files': len(set(item['file'] for item in extracted_data))
-            },
-            'by_company': {},
-            'by_category': {},
-            'detailed_records': []
-        }
+        """Analisis data related party yang telah diekstrak (kolom, bukan loop per record)"""
+        records, facts, items = self.build_tables(extracted_data)
+        n = len(records)
         
-        for record in extracted_data:
-            # Extract company dan tahun dari filename
-            file_parts = record['file'].split('_')
-            company = file_parts[0] if len(file_parts) > 0 else 'UNKNOWN'
-            year = file_parts[1] if len(file_parts) > 1 else 'UNKNOWN'
-            
-            # Parse nilai XBRL
-            parsed_values = self.parse_xbrl_value(record['value'])
-            
-            # Kategorikan
-            category = self.categorize_transaction(record['key'])
-            
-            # Build detailed record
-            detailed_record = {
-                'company': company,
-                'year': year,
-                'file': record['file'],
-                'path': record['path'],
-                'key': record['key'],
-                'category': category,
-                'raw_value': record['value'],
-                'parsed_values': parsed_values
+        # current/prior per record: item terakhir yang context-nya mengandung
+        # 'current' / 'prior' (item 'current' tidak dihitung sebagai 'prior')
+        context = per_unique(facts['context'], lambda c: c.fillna('').astype(str).str.lower())
+        is_current = pd.Series(context).str.contains('current', regex=False).to_numpy(dtype=bool)
+        is_prior = ~is_current & pd.Series(context).str.contains('prior', regex=False).to_numpy(dtype=bool)
+        
+        def last_value(mask):
+            picked = facts.loc[mask, ['rec', 'numeric_value']].drop_duplicates('rec', keep='last')
+            return pd.Series(picked['numeric_value'].to_numpy(), index=picked['rec'].to_numpy()).reindex(range(n))
+        
+        current = last_value(is_current)
+        prior = last_value(is_prior)
+        change = current - prior
+        pct = (change / prior.where(prior != 0)) * 100
+        
+        # parsed_values per record (item fakta, atau raw_value kalau value bukan list)
+        values = records['value'].tolist()
+        parsed = [[] if isinstance(v, (list, dict)) else [{'raw_value': v}] for v in values]
+        for r, item in zip(facts['rec'].tolist(), items):
+            parsed[r].append(item)
+        
+        detailed_records = [
+            {
+                'company': company, 'year': year, 'file': file, 'path': path, 'key': key,
+                'category': category, 'raw_value': raw_value, 'parsed_values': parsed_values,
+                'current_year_value': cur, 'prior_year_value': pri,
+                'value_change': chg, 'change_percentage': chg_pct
             }
-            
-            # Extract current vs prior values
-            current_value = None
-            prior_value = None
-            
-            for pv in parsed_values:
-                if 'current' in pv.get('context', '').lower():
-                    current_value = pv.get('numeric_value')
-                elif 'prior' in pv.get('context', '').lower():
-                    prior_value = pv.get('numeric_value')
-            
-            detailed_record['current_year_value'] = current_value
-            detailed_record['prior_year_value'] = prior_value
-            detailed_record['value_change'] = None
-            detailed_record['change_percentage'] = None
-            
-            if current_value is not None and prior_value is not None:
-                detailed_record['value_change'] = current_value - prior_value
-                if prior_value != 0:
-                    detailed_record['change_percentage'] = (detailed_record['value_change'] / prior_value) * 100
-            
-            analysis['detailed_records'].append(detailed_record)
-            
-            # Aggregate by company
-            if company not in analysis['by_company']:
-                analysis['by_company'][company] = {
-                    'total_records': 0,
-                    'categories': {},
-                    'years': set()
-                }
-            
-            analysis['by_company'][company]['total_records'] += 1
-            analysis['by_company'][company]['years'].add(year)
-            
-            if category not in analysis['by_company'][company]['categories']:
-                analysis['by_company'][company]['categories'][category] = 0
-            analysis['by_company'][company]['categories'][category] += 1
-            
-            # Aggregate by category
-            if category not in analysis['by_category']:
-                analysis['by_category'][category] = {
-                    'total_records': 0,
-                    'companies': set()
-                }
-            
-            analysis['by_category'][category]['total_records'] += 1
-            analysis['by_category'][category]['companies'].add(company)
+            for company, year, file, path, key, category, raw_value, parsed_values, cur, pri, chg, chg_pct in zip(
+                records['company'].tolist(), records['year'].tolist(), records['file'].tolist(),
+                records['path'].tolist(), records['key'].tolist(), records['category'].tolist(),
+                values, parsed, nullable(current), nullable(prior), nullable(change), nullable(pct)
+            )
+        ]
         
-        # Convert sets to lists for JSON serialization
-        for company_data in analysis['by_company'].values():
-            company_data['years'] = list(company_data['years'])
+        by_company = {}
+        company_groups = records.groupby('company', sort=False)
+        category_counts = records.groupby(['company', 'category'], sort=False).size()
+        for company, group in company_groups:
+            by_company[company] = {
+                'total_records': len(group),
+                'categories': {},
+                'years': group['year'].unique().tolist()
+            }
+        for (company, category), count in category_counts.items():
+            by_company[company]['categories'][category] = int(count)
         
-        for category_data in analysis['by_category'].values():
-            category_data['companies'] = list(category_data['companies'])
+        by_category = {}
+        for category, group in records.groupby('category', sort=False):
+            by_category[category] = {
+                'total_records': len(group),
+                'companies': group['company'].unique().tolist()
+            }
         
-        return analysis
+        return {
+            'summary': {
+                'total_records': n,
+                'total_companies': records['company'].nunique(),
+                'total_files': records['file'].nunique()
+            },
+            'by_company': by_company,
+            'by_category': by_category,
+            'detailed_records': detailed_records
+        }
     
     def create_summary_report(self, analysis: Dict[str, Any]) -> str:
         """Buat laporan ringkasan"""